@@ -4,6 +4,8 @@ import operator
 from typing import List
 from utils import read_file, Operator, Part
 
+FILENAME = 'input/day21.txt'
+
 OPS = {
     Operator.ADD: operator.add,
     Operator.SUBTRACT: operator.sub,
@@ -13,8 +15,12 @@ OPS = {
 
 ROOT = 'root'
 HUMN = 'humn'
-LEFT_PAREN = '('
-RIGHT_PAREN = ')'
+INVERSE = {
+    Operator.ADD: Operator.SUBTRACT,
+    Operator.SUBTRACT: Operator.ADD,
+    Operator.MULTIPLY: Operator.DIVIDE,
+    Operator.DIVIDE: Operator.MULTIPLY,
+}
 
 
 class Monkey:
@@ -30,6 +36,14 @@ class Monkey:
     def words(self):
         return self.text.split()
 
+    @property
+    def operands(self):
+        return self.words[0], self.words[2]
+
+    @property
+    def operator(self):
+        return Operator(self.words[1])
+
 
 class Monkeys:
 
@@ -37,76 +51,58 @@ class Monkeys:
         self.part = part
         self.monkeys = {words[0]: Monkey(words[0], words[1]) for line in data if \
                         (words := [w.strip() for w in line.split(':')])}
+        self.ancestors = set()
 
-    def build_expression(self, id: str) -> str:
+    def value(self, id: str):
         monkey = self.monkeys[id]
         if monkey.knows_it_all:
-            return monkey.text if self.part == Part.PT1 else \
-                monkey.text if monkey.id != HUMN else HUMN
-        else:
-            return LEFT_PAREN + \
-                   self.build_expression(monkey.words[0]) + \
-                   monkey.words[1] + \
-                   self.build_expression(monkey.words[2]) + \
-                    RIGHT_PAREN
+            return int(monkey.text)
+        left, right = monkey.operands
+        return OPS[monkey.operator](self.value(left), self.value(right))
+
+    def humn_ancestors(self):
+        parents = {operand: monkey.id for monkey in self.monkeys.values() if not monkey.knows_it_all
+                   for operand in monkey.operands}
+        ancestors = {HUMN}
+        id = HUMN
+        while id in parents:
+            id = parents[id]
+            ancestors.add(id)
+        return ancestors
 
     def find_humn(self):
-        exp1 = self.build_expression(self.monkeys[ROOT].words[0])
-        exp2 = self.build_expression(self.monkeys[ROOT].words[2])
-        return self.unwind(
-            eval(exp1) if HUMN in exp2 else eval(exp2),
-            exp1 if HUMN in exp1 else exp2)
+        self.ancestors = self.humn_ancestors()
+        left, right = self.monkeys[ROOT].operands
+        return self.unwind(self.value(right), left) if left in self.ancestors else \
+            self.unwind(self.value(left), right)
 
     def unwind(self, known: int, unknown: str):
-        exp1, exp2, op = self.__divide_unknown(unknown)
-        if HUMN in exp1:
-            new_known = int(OPS[self.__get_inverse_operator(op)](known, eval(exp2)))
-            return new_known if exp1 == HUMN else self.unwind(new_known, exp1)
-        else:
-            new_known = int(OPS[self.__get_inverse_operator(op)](known, eval(exp1))) if \
-                op in [Operator.ADD, Operator.MULTIPLY] else \
-                int(OPS[op](eval(exp1), known))
-            return new_known if exp2 == HUMN else self.unwind(new_known, exp2)
-
-    def __divide_unknown(self, text: str):
-        text = self.__strip_outer_parens(text)
-        op_ind = self.__find_op(text)
-        return text[:op_ind], text[op_ind+1:], Operator(text[op_ind])
-
-    @staticmethod
-    def __find_op(text: str):
-        if LEFT_PAREN not in text:
-            ind = 0
-            while ind < len(text):
-                if not (text[ind].isalpha() or text[ind].isnumeric()):
-                    return ind
-                ind += 1
-
-        num_paren = 1 if text[0] == LEFT_PAREN else 0
-        ind = 1
-        while num_paren > 0:
-            num_paren += 1 if text[ind] == LEFT_PAREN else -1 if text[ind] == RIGHT_PAREN else 0
-            ind += 1
-        return ind
-
-    @staticmethod
-    def __get_inverse_operator(op: Operator):
-        return Operator.SUBTRACT if op == Operator.ADD else \
-            Operator.ADD if op == Operator.SUBTRACT else \
-            Operator.MULTIPLY if op == Operator.DIVIDE else \
-            Operator.DIVIDE
-
-    @staticmethod
-    def __strip_outer_parens(text: str):
-        return text[1:len(text) - 1] if LEFT_PAREN in text else text
+        if unknown == HUMN:
+            return known
+        monkey = self.monkeys[unknown]
+        left, right = monkey.operands
+        op = monkey.operator
+        if left in self.ancestors:
+            return self.unwind(int(OPS[INVERSE[op]](known, self.value(right))), left)
+        new_known = int(OPS[INVERSE[op]](known, self.value(left))) if \
+            op in [Operator.ADD, Operator.MULTIPLY] else \
+            int(OPS[op](self.value(left), known))
+        return self.unwind(new_known, right)
 
 
-if __name__ == '__main__':
-    filename = 'input/day21.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return data
+
+
+def part1(data: List[str]):
+    return int(Monkeys(data, Part.PT1).value(ROOT))
 
-    monkeys = Monkeys(data, Part.PT1)
-    print(f'The answer to Pt 1 is {int(eval(monkeys.build_expression(ROOT)))}')
 
-    monkeys = Monkeys(data, Part.PT2)
-    print(f'The answer to Pt 2 is {monkeys.find_humn()}')
+def part2(data: List[str]):
+    return Monkeys(data, Part.PT2).find_humn()
+
+
+if __name__ == '__main__':
+    data = parse(read_file(FILENAME))
+    print(f'The answer to Pt 1 is {part1(data)}')
+    print(f'The answer to Pt 2 is {part2(data)}')
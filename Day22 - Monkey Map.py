@@ -5,19 +5,18 @@ from enum import Enum, auto
 import numpy as np
 from math import isnan
 
-from utils import read_file, Part, XYPair, Direction, XYZ
+from cache import cached_arrays
+from parsing import char_grid
+from utils import read_file, Part, XYPair, Direction, XYZ, DX, DY, TURNS
+
+TEST = False
+FILENAME = f'input/{"test" if TEST else "day"}22.txt'
+SIZE = 4 if TEST else 50
 
 POUND = '#'
 ROCK = 8
 SPACE = 0
 
-DIR_PTS = {
-    Direction.RIGHT: 0,
-    Direction.DOWN: 1,
-    Direction.LEFT: 2,
-    Direction.UP: 3
-}
-
 
 class Axis(str, Enum):
     X = 'x'
@@ -97,13 +96,8 @@ class Map:
         data = data[:-2]
         self.max_x = len(data)
         self.max_y = max([len(line) for line in data])
-        self.map = np.nan * np.zeros((self.max_x, self.max_y), dtype=int)
-        self.pos = None
-        for i, line in enumerate(data):
-            for j, c in enumerate(line):
-                if not self.pos and c != ' ':
-                    self.pos = XYPair((i, j))
-                self.map[i, j] = np.nan if c == ' ' else ROCK if c == POUND else SPACE
+        self.map = cached_arrays(__file__, data, ['map'], lambda: self.__parse(data))['map']
+        self.pos = XYPair(tuple(np.argwhere(~np.isnan(self.map))[0].tolist()))
 
         self.cube = np.nan * np.zeros((self.size+2, self.size+2, self.size+2))
         # Here is where we hard-code a solution because a general solution is just too hard
@@ -165,7 +159,8 @@ class Map:
 
     @property
     def answer_pt1(self):
-        return 1000 * (self.pos.x + 1) + 4 * (self.pos.y + 1) + DIR_PTS[self.dir]
+        # Directions are numbered clockwise from right, just like the facing in the password
+        return 1000 * (self.pos.x + 1) + 4 * (self.pos.y + 1) + self.dir
 
     @property
     def answer_pt2(self):
@@ -212,16 +207,8 @@ class Map:
             return len(segment), target - len(segment)
 
     def __change_dir_pt1(self, turn: str):
-        if turn == 'R':
-            self.dir = Direction.DOWN if self.dir == Direction.RIGHT else \
-                Direction.LEFT if self.dir == Direction.DOWN else \
-                Direction.UP if self.dir == Direction.LEFT else \
-                Direction.RIGHT
-        if turn == 'L':
-            self.dir = Direction.UP if self.dir == Direction.RIGHT else \
-                Direction.RIGHT if self.dir == Direction.DOWN else \
-                Direction.DOWN if self.dir == Direction.LEFT else \
-                Direction.LEFT
+        if turn in TURNS:
+            self.dir = TURNS[turn][self.dir]
 
     def __get_segment_pt2(self):
         x, y, z = self.cube_pos.coordinates
@@ -278,14 +265,9 @@ class Map:
         return 0
 
     def __move(self, spaces: int):
-        if self.dir == Direction.RIGHT:
-            self.pos.y += spaces
-        elif self.dir == Direction.DOWN:
-            self.pos.x += spaces
-        elif self.dir == Direction.LEFT:
-            self.pos.y -= spaces
-        else:
-            self.pos.x -= spaces
+        # pos is (row, column), so a step's column change is DX and its row change DY
+        self.pos.x += DY[self.dir] * spaces
+        self.pos.y += DX[self.dir] * spaces
 
     @staticmethod
     def __get_spaces_to_move(ind: int, segment: np.array, target: int):
@@ -322,17 +304,29 @@ class Map:
         target, self.instructions = self.__get_leading_num(self.instructions)
         return turn, target
 
+    @staticmethod
+    def __parse(data: List[str]):
+        chars = char_grid(data)
+        return {'map': np.where(chars == ' ', np.nan, np.where(chars == POUND, ROCK, SPACE))}
+
 
-if __name__ == '__main__':
-    TEST = False
-    filename = f'input/{"test" if TEST else "day"}22.txt'
-    size = 4 if TEST else 50
-    data = read_file(filename)
+def parse(data: List[str]):
+    return data
 
-    map = Map(data, size, TEST)
+
+def part1(data: List[str]):
+    map = Map(data, SIZE, TEST)
     map.process(Part.PT1)
-    print(f'The answer to Pt 1 is {map.answer_pt1}')
+    return map.answer_pt1
+
 
-    map = Map(data, size, TEST)
+def part2(data: List[str]):
+    map = Map(data, SIZE, TEST)
     map.process(Part.PT2)
-    print(f'The answer to Pt 2 is {map.answer_pt2}')
+    return map.answer_pt2
+
+
+if __name__ == '__main__':
+    data = parse(read_file(FILENAME))
+    print(f'The answer to Pt 1 is {part1(data)}')
+    print(f'The answer to Pt 2 is {part2(data)}')
@@ -3,150 +3,111 @@ from __future__ import annotations
 import numpy as np
 from typing import List, Tuple
 from itertools import product
-from utils import read_file, Part, XYPair, MapDirection, CircularLinkedList
+from cache import cached_arrays
+from parsing import char_grid
+from utils import read_file, phase, Part, Bitboard, XYPair, Direction, DenseGrid, Grid, Ring, DX, DY, \
+    OPPOSITE, TURN_RIGHT
 
-SIZE = 1000
-ELF = 8
+FILENAME = 'input/day23.txt'
 NORTH = 1000
 SOUTH = 2000
 WEST = 3000
 EAST = 4000
-EMPTY = 6000
 
-MOVING_ELF_VALUES = {
-    MapDirection.NORTH: SOUTH,
-    MapDirection.SOUTH: NORTH,
-    MapDirection.WEST: EAST,
-    MapDirection.EAST: WEST
-}
+# Elves consider north, south, west and east in that order, starting one later each round
+CONSIDERED = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+# Indexed by direction: the mark an elf leaves on its cell when it proposes to move that way
+MARKS = (EAST, SOUTH, WEST, NORTH)
+# Indexed by direction: the three (row, column) offsets that must be free to move that way
+FRONT_OFFSETS = tuple([tuple([(DY[d] + k * DY[TURN_RIGHT[d]], DX[d] + k * DX[TURN_RIGHT[d]]) for k in (-1, 0, 1)])
+                       for d in Direction])
+
+
+def parse_grove(data: List[str]):
+    return {'grove': char_grid(data, '.') != '.'}
 
 
 class Spot(XYPair):
+    __slots__ = ()
+
     def __init__(self, coordinates: Tuple[int, int]):
         super().__init__(coordinates)
 
-    def get_neighboring_coordinates(self, dir: MapDirection):
-        return Spot((self.x-1, self.y)) if dir == MapDirection.NORTH else\
-            Spot((self.x+1, self.y)) if dir == MapDirection.SOUTH else \
-            Spot((self.x, self.y-1)) if dir == MapDirection.WEST else \
-            Spot((self.x, self.y+1))
+    def get_neighboring_coordinates(self, dir: Direction):
+        return Spot((self.x + DY[dir], self.y + DX[dir]))
 
 
 class Grove:
     def __init__(self, data: List[str], part: Part):
         self.part = part
-        self.grid = EMPTY * np.ones((SIZE, SIZE), dtype=int)
-        self.offset = SIZE // 2
-        self.origin = Spot((self.offset, self.offset))
-        for i, line in enumerate(data):
-            for j, c in enumerate(line):
-                self.__set_grid(i, j, EMPTY if c == '.' else ELF)
-        self.directions = CircularLinkedList([MapDirection.NORTH,
-                                              MapDirection.SOUTH,
-                                              MapDirection.WEST,
-                                              MapDirection.EAST])
-        self.first_halves: List[np.array] = []
-        self.second_halves: List[np.array] = []
+        self.grid = DenseGrid(fill=False, dtype=bool)
+        self.origin = Spot((0, 0))
+        self.grid.set_region((0, 0), cached_arrays(__file__, data, ['grove'], lambda: parse_grove(data))['grove'])
+        self.directions = Ring(CONSIDERED)
 
     @property
     def rectangle(self):
-        elves = np.nonzero(self.grid == ELF)
-        xmin, xmax = min(elves[0]), max(elves[0])
-        ymin, ymax = min(elves[1]), max(elves[1])
-        return self.grid[xmin:xmax+1, ymin:ymax+1]
+        (xmin, ymin), (xmax, ymax) = self.grid.bounds
+        return self.grid.get_region((xmin, ymin), (xmax+1, ymax+1))
 
     @property
     def answer(self):
-        return np.count_nonzero(self.rectangle == 6000)
-
-    @staticmethod
-    def nan_equal(a, b):
-        try:
-            np.testing.assert_equal(a, b)
-        except AssertionError:
-            return False
-        return True
+        return np.count_nonzero(~self.rectangle)
 
     def process(self, num: int = None):
         if self.part == Part.PT1:
             for _ in range(num):
-                directions = [self.directions.get_next() for _ in range(4)]
-                first_half = self.first_half(directions)
-                self.first_halves.append(first_half)
-                self.second_half(first_half)
-                self.second_halves.append(self.grid)
-                self.directions.head = self.directions.head.next
-                self.directions.current = self.directions.head
+                self.play_round()
             return None
-        else:
-            done = False
-            rounds = 0
-            while not done:
-                directions = [self.directions.get_next() for _ in range(4)]
-                first_half = self.first_half(directions)
-                self.first_halves.append(first_half)
-                self.second_half(first_half)
-                self.second_halves.append(self.grid.copy())
-                self.directions.head = self.directions.head.next
-                self.directions.current = self.directions.head
-                rounds += 1
-                if len(self.second_halves) > 1:
-                    if np.array_equal(self.second_halves[-1], self.second_halves[-2]):
-                        done = True
-            return rounds
-
-    def first_half(self, directions: List[MapDirection]):
-        elves = np.nonzero(self.grid == ELF)
-        first_half = EMPTY * np.zeros(self.grid.shape)
-        for i in range(len(elves[0])):
-            elf = Spot((elves[0][i], elves[1][i]))
+        # The grove is settled once a round moves nobody, so there is no need to compare whole grids
+        rounds = 1
+        while self.play_round():
+            rounds += 1
+        return rounds
+
+    def play_round(self) -> int:
+        moved = self.second_half(self.first_half(self.directions.take(len(CONSIDERED))))
+        self.directions.advance()
+        return moved
+
+    def first_half(self, directions: List[Direction]):
+        first_half = DenseGrid(fill=0)
+        for coordinates in self.grid.find(True):
+            elf = Spot(coordinates)
             if not self.__stay_put(elf):
                 dir_to_move = self.__dir_to_move(elf, directions)
-                if dir_to_move:
+                if dir_to_move is not None:
                     spot_to_move = elf.get_neighboring_coordinates(dir_to_move)
-                    first_half[elf.x, elf.y] = NORTH if dir_to_move == MapDirection.NORTH else\
-                        SOUTH if dir_to_move == MapDirection.SOUTH else\
-                        WEST if dir_to_move == MapDirection.WEST else \
-                        EAST
+                    first_half[elf.x, elf.y] = MARKS[dir_to_move]
                     val = first_half[spot_to_move.coordinates]
-                    first_half[spot_to_move.coordinates] = 1 if val == EMPTY else val + 1
+                    first_half[spot_to_move.coordinates] = val + 1
         return first_half
 
-    def second_half(self, first_half: np.array):
-        spots_to_move_to = np.nonzero(first_half == 1)
-        num = len(spots_to_move_to[0]) if spots_to_move_to[0].size > 0 else 0
-        for i in range(num):
-            spot = Spot((spots_to_move_to[0][i], spots_to_move_to[1][i]))
-            self.__move_elf(spot, first_half)
+    def second_half(self, first_half: Grid) -> int:
+        targets = first_half.find(1)
+        for coordinates in targets:
+            self.__move_elf(Spot(coordinates), first_half)
+        return len(targets)
 
-    def __move_elf(self, spot: Spot, first_half: np.array):
-        for dir in MOVING_ELF_VALUES.keys():
+    def __move_elf(self, spot: Spot, first_half: Grid):
+        for dir in CONSIDERED:
             val = first_half[spot.get_neighboring_coordinates(dir).coordinates]
-            self.grid[spot.x, spot.y] = ELF
-            if MOVING_ELF_VALUES[dir] == val:
+            self.grid[spot.x, spot.y] = True
+            # The elf arriving from this side proposed moving the opposite way
+            if MARKS[OPPOSITE[dir]] == val:
                 self.__remove_elf(spot, dir)
 
-    def __remove_elf(self, spot: Spot, dir: MapDirection):
-        if dir == MapDirection.SOUTH:
-            self.grid[spot.x + 1, spot.y] = EMPTY
-        elif dir == MapDirection.NORTH:
-            self.grid[spot.x - 1, spot.y] = EMPTY
-        elif dir == MapDirection.WEST:
-            self.grid[spot.x, spot.y - 1] = EMPTY
-        else:
-            self.grid[spot.x, spot.y + 1] = EMPTY
-
-    def __set_grid(self, i: int, j: int, val: int):
-        self.grid[self.offset + i, self.offset + j] = val
+    def __remove_elf(self, spot: Spot, dir: Direction):
+        self.grid[spot.x + DY[dir], spot.y + DX[dir]] = False
 
     def __stay_put(self, elf: Spot):
         neighbors = self.__get_all_neighbors(elf)
         return self.__are_free(neighbors)
 
-    def __dir_to_move(self, elf: Spot, directions: List[MapDirection]) -> MapDirection:
+    def __dir_to_move(self, elf: Spot, directions: List[Direction]) -> Direction:
         return next(iter([dir for dir in directions if self.__can_move(elf, dir)]), None)
 
-    def __can_move(self, elf: Spot, dir: MapDirection):
+    def __can_move(self, elf: Spot, dir: Direction):
         neighbors = self.__get_neighbors(elf, dir)
         return self.__are_free(neighbors)
 
@@ -157,26 +118,108 @@ class Grove:
         offsets = [i for i in product([1, 0, -1], repeat=2) if i != (0, 0)]
         return [self.__neighbor(spot, offset) for offset in offsets]
 
-    def __get_neighbors(self, spot: XYPair, dir: MapDirection):
-        offsets = [(-1, -1), (-1, 0), (-1, 1)] if dir == MapDirection.NORTH else \
-            [(1, -1), (1, 0), (1, 1)] if dir == MapDirection.SOUTH else \
-            [(-1, -1), (0, -1), (1, -1)] if dir == MapDirection.WEST else \
-            [(-1, 1), (0, 1), (1, 1)]
-        return [self.__neighbor(spot, offset) for offset in offsets]
+    def __get_neighbors(self, spot: XYPair, dir: Direction):
+        return [self.__neighbor(spot, offset) for offset in FRONT_OFFSETS[dir]]
 
     @staticmethod
     def __are_free(neighbors: List[int]):
-        return all([n != ELF for n in neighbors])
+        return not any(neighbors)
 
 
-if __name__ == '__main__':
-    filename = 'input/day23.txt'
-    data = read_file(filename)
+class BitGrove:
+    # All elves move together through whole-board shifts
+    # Rounds that can run before elves could walk off the board
+    MARGIN = 16
 
+    def __init__(self, data: List[str]):
+        grove = cached_arrays(__file__, data, ['grove'], lambda: parse_grove(data))['grove']
+        self.elves = Bitboard.from_array(grove).padded(self.MARGIN)
+        self.directions = Ring(CONSIDERED)
+
+    @property
+    def answer(self):
+        (xmin, ymin), (xmax, ymax) = self.elves.bounds
+        return (xmax - xmin + 1) * (ymax - ymin + 1) - self.elves.count()
+
+    def process(self, num: int = None):
+        if num is not None:
+            for _ in range(num):
+                self.play_round()
+            return None
+        rounds = 1
+        while self.play_round():
+            rounds += 1
+        return rounds
+
+    def play_round(self) -> int:
+        self.__make_room()
+        elves = self.elves
+        north, south = elves.shifted(1, 0), elves.shifted(-1, 0)
+        # Each board marks the cells whose neighbour in that direction is an elf
+        neighbors = {
+            Direction.UP: north | north.shifted(0, 1) | north.shifted(0, -1),
+            Direction.DOWN: south | south.shifted(0, 1) | south.shifted(0, -1),
+            Direction.LEFT: elves.shifted(0, 1) | north.shifted(0, 1) | south.shifted(0, 1),
+            Direction.RIGHT: elves.shifted(0, -1) | north.shifted(0, -1) | south.shifted(0, -1),
+        }
+        crowded = neighbors[Direction.UP] | neighbors[Direction.DOWN] | \
+            neighbors[Direction.LEFT] | neighbors[Direction.RIGHT]
+        waiting = elves & crowded
+        targets = {}
+        for direction in self.directions.take(len(CONSIDERED)):
+            proposing = waiting & ~neighbors[direction]
+            waiting = waiting & neighbors[direction]
+            targets[direction] = proposing.shifted(DY[direction], DX[direction])
+        # Only elves coming from opposite sides can propose the same cell
+        clashes = (targets[Direction.UP] & targets[Direction.DOWN]) | \
+            (targets[Direction.LEFT] & targets[Direction.RIGHT])
+        arrived = Bitboard(elves.height, elves.width)
+        left = Bitboard(elves.height, elves.width)
+        for direction, target in targets.items():
+            target = target & ~clashes
+            arrived = arrived | target
+            left = left | target.shifted(-DY[direction], -DX[direction])
+        self.elves = (elves & ~left) | arrived
+        self.directions.advance()
+        return arrived.count()
+
+    def __make_room(self):
+        (xmin, ymin), (xmax, ymax) = self.elves.bounds
+        if min(xmin, ymin) < 2 or xmax > self.elves.height - 3 or ymax > self.elves.width - 3:
+            self.elves = self.elves.padded(self.MARGIN)
+
+
+def parse(data: List[str]):
+    return data
+
+
+def part1(data: List[str]):
+    grove = BitGrove(data)
+    with phase('simulate'):
+        grove.process(10)
+    return grove.answer
+
+
+def part2(data: List[str]):
+    grove = BitGrove(data)
+    with phase('simulate'):
+        return grove.process()
+
+
+def dense_part1(data: List[str]):
     grove = Grove(data, Part.PT1)
-    grove.process(10)
-    print(f'The answer to Pt 1 is {grove.answer}')
+    with phase('simulate'):
+        grove.process(10)
+    return grove.answer
 
+
+def dense_part2(data: List[str]):
     grove = Grove(data, Part.PT2)
-    rounds = grove.process()
-    print(f'The answer to Pt 2 is {rounds}')
+    with phase('simulate'):
+        return grove.process()
+
+
+if __name__ == '__main__':
+    data = parse(read_file(FILENAME))
+    print(f'The answer to Pt 1 is {part1(data)}')
+    print(f'The answer to Pt 2 is {part2(data)}')
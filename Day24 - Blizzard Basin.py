@@ -3,10 +3,13 @@ from __future__ import annotations
 from typing import List
 import numpy as np
 from math import lcm
-from queue import Queue
 
-from utils import read_file, XYPair
+from cache import cached_arrays
+from parsing import char_grid
+from search import Packer, astar
+from utils import read_file, phase, Bitboard, XYPair, PROGRESS, DIRECTION_CHARS, DX, DY
 
+FILENAME = 'input/day24.txt'
 
 WALL = 8
 SPACE = 0
@@ -14,25 +17,24 @@ RIGHT = 1
 LEFT = 2
 UP = 3
 DOWN = 4
+MASKS = {'walls': '#', 'right': '>', 'left': '<', 'up': '^', 'down': 'v'}
+
+
+def parse_masks(data: List[str]):
+    chars = char_grid(data)
+    return {name: chars == char for name, char in MASKS.items()}
 
 
 class Valley:
     def __init__(self, data: List[str]):
         self.height, self.width = len(data), len(data[0])
-        self.walls = np.zeros((self.height, self.width), dtype=bool)
-        self.right, self.left, self.up, self.down = \
-            self.walls.copy(), self.walls.copy(), self.walls.copy(), self.walls.copy()
-        for i, line in enumerate(data):
-            for j, c in enumerate(line):
-                self.walls[i, j] = True if c == '#' else SPACE
-                self.right[i, j] = True if c == '>' else SPACE
-                self.left[i, j] = True if c == '<' else SPACE
-                self.up[i, j] = True if c == '^' else SPACE
-                self.down[i, j] = True if c == 'v' else SPACE
+        with phase('parse'):
+            masks = cached_arrays(__file__, data, list(MASKS), lambda: parse_masks(data))
+        self.walls, self.right, self.left, self.up, self.down = [masks[name] for name in MASKS]
         self.repeat = lcm(self.height - 2, self.width - 2)
-        self.blizzards = self.blizzard_pattern()
-        self.queue = Queue()
-        self.visited = {}
+        with phase('precompute'):
+            self.blizzards = self.blizzard_pattern()
+        self.packer = Packer(self.height, self.width, self.repeat)
         self.fixed_positions = {
             'start': XYPair((0, 1)),
             'end': XYPair((self.height-1, self.width-2))
@@ -45,14 +47,10 @@ class Valley:
     def potential_moves(self, pos: XYPair, num_moves: int):
         potential_moves = []
         blocked = self.blocked(num_moves)
-        if pos.x > 0 and not blocked[pos.x-1, pos.y]:
-            potential_moves.append(XYPair((pos.x-1, pos.y)))
-        if pos.x < self.height - 1 and not blocked[pos.x+1, pos.y]:
-            potential_moves.append(XYPair((pos.x+1, pos.y)))
-        if pos.y > 0 and not blocked[pos.x, pos.y+1]:
-            potential_moves.append(XYPair((pos.x, pos.y+1)))
-        if pos.y < self.width - 1 and not blocked[pos.x, pos.y-1]:
-            potential_moves.append(XYPair((pos.x, pos.y-1)))
+        for row_step, column_step in zip(DY, DX):
+            x, y = pos.x + row_step, pos.y + column_step
+            if 0 <= x < self.height and 0 <= y < self.width and not blocked[x, y]:
+                potential_moves.append(XYPair((x, y)))
         if not blocked[pos.x, pos.y]:
             potential_moves.append(XYPair((pos.x, pos.y)))
         return potential_moves
@@ -73,36 +71,82 @@ class Valley:
         return self.blizzards
 
     def bfs(self, start: str, end: str, num_moves: int):
+        with phase('search'):
+            return self.__astar(start, end, num_moves)
+
+    def __astar(self, start: str, end: str, num_moves: int):
+        # States are packed (row, column, minute within the blizzard cycle) and every move takes a minute,
+        # so the distance left to the exit never overestimates the minutes still needed
         start_pos = self.fixed_positions[start]
         end_pos = self.fixed_positions[end]
-        self.queue.put((start_pos, num_moves))
-        min_moves = 1_000_000
-
-        while self.queue.qsize() > 0:
-            pos, num_moves = self.queue.get()
-            num_moves += 1
-            for new_pos in self.potential_moves(pos, num_moves):
-                index = num_moves % self.repeat
-                if new_pos == end_pos:
-                    min_moves = min(min_moves, num_moves)
-                    continue
-                if f"{new_pos.coordinates}-{index}" not in self.visited:
-                    self.queue.put((new_pos, num_moves))
-                    self.visited[f"{new_pos.coordinates}-{index}"] = min_moves
-        return min_moves
 
+        def neighbors(key: int):
+            x, y, index = self.packer.unpack(key)
+            index = (index + 1) % self.repeat
+            return [(self.packer.pack(pos.x, pos.y, index), 1)
+                    for pos in self.potential_moves(XYPair((x, y)), index)]
 
-if __name__ == '__main__':
-    filename = 'input/day24.txt'
-    data = read_file(filename)
+        def distance_left(key: int):
+            x, y, _ = self.packer.unpack(key)
+            return abs(x - end_pos.x) + abs(y - end_pos.y)
 
-    valley = Valley(data)
-    min_moves = valley.bfs('start', 'end', 0)
-    print(f"The answer to Part1 is {min_moves}")
+        def is_goal(key: int):
+            x, y, _ = self.packer.unpack(key)
+            return x == end_pos.x and y == end_pos.y
+
+        start_key = self.packer.pack(start_pos.x, start_pos.y, num_moves % self.repeat)
+        result = astar([start_key], neighbors, is_goal, distance_left)
+        return num_moves + result.cost if result.found else 1_000_000
+
+
+class BitValley:
+    # Every cell the expedition could be in is tracked at once, one minute at a time, on the valley's interior
+    # Each blizzard mask moves one step its way every minute
+    BLIZZARDS = {name: DIRECTION_CHARS[char] for name, char in MASKS.items() if char in DIRECTION_CHARS}
+
+    def __init__(self, data: List[str]):
+        with phase('parse'):
+            masks = cached_arrays(__file__, data, list(MASKS), lambda: parse_masks(data))
+        self.blizzards = {name: Bitboard.from_array(masks[name][1:-1, 1:-1]) for name in self.BLIZZARDS}
+        self.height, self.width = len(data) - 2, len(data[0]) - 2
+        self.entrances = {'start': (0, 0), 'end': (self.height - 1, self.width - 1)}
+
+    def blocked(self, minute: int) -> Bitboard:
+        boards = [board.rotated(DY[direction] * minute, DX[direction] * minute) for direction, board in
+                  zip(self.BLIZZARDS.values(), self.blizzards.values())]
+        return boards[0] | boards[1] | boards[2] | boards[3]
 
-    valley = Valley(data)
+    def bfs(self, start: str, end: str, num_moves: int):
+        with phase('search'):
+            entrance, goal = self.entrances[start], self.entrances[end]
+            reachable = Bitboard(self.height, self.width)
+            minute = num_moves
+            while not reachable[goal]:
+                PROGRESS.tick('minutes')
+                minute += 1
+                reachable = reachable | reachable.shifted(1, 0) | reachable.shifted(-1, 0) | \
+                    reachable.shifted(0, 1) | reachable.shifted(0, -1)
+                # Waiting outside the valley is always safe, so the entrance can be stepped into at any minute
+                reachable[entrance] = True
+                reachable = reachable & ~self.blocked(minute)
+            return minute + 1
+
+
+def parse(data: List[str]):
+    return BitValley(data)
+
+
+def part1(valley: BitValley):
+    return valley.bfs('start', 'end', 0)
+
+
+def part2(valley: BitValley):
+    min_moves = valley.bfs('start', 'end', 0)
     plus_moves_back = valley.bfs('end', 'start', min_moves)
+    return valley.bfs('start', 'end', plus_moves_back)
 
-    valley = Valley(data)
-    total_moves = valley.bfs('start', 'end', plus_moves_back)
-    print(f"The answer to Part2 is {total_moves}")
+
+if __name__ == '__main__':
+    valley = parse(read_file(FILENAME))
+    print(f"The answer to Part1 is {part1(valley)}")
+    print(f"The answer to Part2 is {part2(valley)}")
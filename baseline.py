@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Optional
+
+BASELINE_FILE = 'baseline.json'
+REAL_INPUT = 'input'
+RSS = 'rss'
+TRACED = 'traced'
+DEFAULT_THRESHOLD = 0.2
+MIN_SECONDS = 0.005
+MIN_BYTES = 1024 * 1024
+
+Metrics = Dict[str, float]
+Baseline = Dict[str, Dict[str, Metrics]]
+
+
+def metrics(timings: Dict[str, float], rss: Optional[Dict[str, int]] = None,
+            traced: Optional[Dict[str, int]] = None) -> Metrics:
+    values = dict(timings)
+    for kind, sizes in [(RSS, rss or {}), (TRACED, traced or {})]:
+        values.update({f'{stage}:{kind}': size for stage, size in sizes.items()})
+    return values
+
+
+def is_memory(metric: str) -> bool:
+    return metric.endswith(f':{RSS}') or metric.endswith(f':{TRACED}')
+
+
+def size_key(scale: Optional[float]) -> str:
+    return REAL_INPUT if scale is None else str(float(scale))
+
+
+def load(path: str = BASELINE_FILE) -> Baseline:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save(entries: Baseline, path: str = BASELINE_FILE):
+    baseline = load(path)
+    for day, sizes in entries.items():
+        baseline.setdefault(day, {}).update(sizes)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def add_entry(entries: Baseline, day: int, scale: Optional[float], values: Metrics):
+    entries.setdefault(str(day), {})[size_key(scale)] = values
+
+
+class Delta:
+    def __init__(self, day: str, size: str, metric: str, before: float, after: float):
+        self.day = day
+        self.size = size
+        self.metric = metric
+        self.before = before
+        self.after = after
+
+    @property
+    def ratio(self):
+        return (self.after - self.before) / self.before if self.before > 0 else 0.0
+
+    @property
+    def significant(self):
+        return abs(self.after - self.before) >= (MIN_BYTES if is_memory(self.metric) else MIN_SECONDS)
+
+    def is_regression(self, threshold: float):
+        return self.significant and self.ratio > threshold
+
+    def format_value(self, value: float):
+        return f'{value / MIN_BYTES:.1f}MB' if is_memory(self.metric) else f'{value:.4f}s'
+
+
+def compare(baseline: Baseline, current: Baseline) -> List[Delta]:
+    deltas = []
+    for day, sizes in current.items():
+        for size, values in sizes.items():
+            before = baseline.get(day, {}).get(size, {})
+            deltas.extend([Delta(day, size, metric, before[metric], value)
+                           for metric, value in values.items() if metric in before])
+    return sorted(deltas, key=lambda d: (int(d.day), d.size, d.metric))
+
+
+def report_comparison(deltas: List[Delta], threshold: float = DEFAULT_THRESHOLD) -> List[Delta]:
+    print(f"\n{'Day':>3}  {'size':>6}  {'metric':>13}  {'baseline':>10}  {'current':>10}  {'delta':>8}")
+    for delta in deltas:
+        flag = '  REGRESSION' if delta.is_regression(threshold) else ''
+        print(f'{delta.day:>3}  {delta.size:>6}  {delta.metric:>13}  {delta.format_value(delta.before):>10}  '
+              f'{delta.format_value(delta.after):>10}  {100 * delta.ratio:>+7.1f}%{flag}')
+    regressions = [delta for delta in deltas if delta.is_regression(threshold)]
+    print(f'\n{len(regressions)} regression(s) past {100 * threshold:.0f}% out of {len(deltas)} comparisons')
+    return regressions
+
+
+def add_arguments(parser):
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE_FILE, metavar='PATH',
+                        help=f'store these results in a baseline file (default: {BASELINE_FILE})')
+    parser.add_argument('--compare', nargs='?', const=BASELINE_FILE, metavar='PATH',
+                        help=f'compare these results with a baseline file (default: {BASELINE_FILE})')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative growth in time or memory reported as a regression')
+
+
+def handle_arguments(args, entries: Baseline):
+    regressions = []
+    if args.compare:
+        regressions = report_comparison(compare(load(args.compare), entries), args.threshold)
+    if args.save_baseline:
+        save(entries, args.save_baseline)
+    if regressions:
+        raise SystemExit(1)
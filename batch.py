@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+
+from cache import CACHE_DIR, ResultCache, to_json
+from runner import STAGES, DayResult, add_budget_arguments, add_parse_cache_arguments, budget_from, format_seconds, \
+    load_day, parse_cache_from, run_input
+from utils import Budget
+
+GLOB_CHARS = '*?['
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    filenames = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            filenames += sorted([entry.path for entry in os.scandir(pattern)
+                                 if entry.is_file() and not entry.name.startswith('.')])
+        elif any([char in pattern for char in GLOB_CHARS]):
+            filenames += sorted([path for path in glob.glob(pattern) if os.path.isfile(path)])
+        else:
+            filenames.append(pattern)
+    return list(dict.fromkeys(filenames))
+
+
+def run_batch(day: int, filenames: List[str], workers: Optional[int] = None,
+              cache: Optional[ResultCache] = None, budget: Optional[Budget] = None) -> Iterator[DayResult]:
+    # Results come back in the order they finish, not the order they were given
+    if workers == 1:
+        load_day(day)
+        for filename in filenames:
+            yield run_input(day, filename, cache=cache, budget=budget)
+        return
+    # Each worker loads the day once, so module-level tables and imports are shared by all its inputs
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_day, initargs=(day,)) as pool:
+        futures = [pool.submit(run_input, day, filename, cache=cache, budget=budget) for filename in filenames]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def format_answers(result: DayResult) -> str:
+    answers = []
+    for part, answer in result.answers.items():
+        answer = f'\n{answer}' if isinstance(answer, str) and '\n' in answer else answer
+        answers.append(f'part {part.value}: {answer}')
+    return ', '.join(answers)
+
+
+def as_record(result: DayResult) -> dict:
+    return {'day': result.day, 'filename': result.filename,
+            'answers': {part.value: answer for part, answer in result.answers.items()},
+            'timings': result.timings, 'cached': result.cached, 'error': result.error}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Solve many inputs for one day in a pool of warm workers')
+    parser.add_argument('day', type=int)
+    parser.add_argument('inputs', nargs='+', help='input files, directories of inputs or glob patterns')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='size of the process pool')
+    parser.add_argument('--json', action='store_true', help='stream one JSON object per input instead of a table')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='directory holding cached answers')
+    parser.add_argument('--no-cache', action='store_true', help='neither read nor write cached answers')
+    add_budget_arguments(parser)
+    add_parse_cache_arguments(parser)
+    args = parser.parse_args(argv)
+
+    filenames = expand_inputs(args.inputs)
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    parse_cache = parse_cache_from(args)
+    width = max([len(filename) for filename in filenames], default=5)
+    if not args.json:
+        print(f"{'input':<{width}}  " + '  '.join([f'{stage:>9}' for stage in STAGES + ['total']]) + '  answers')
+
+    results = []
+    start = time.perf_counter()
+    for result in run_batch(args.day, filenames, args.workers, cache, budget_from(args)):
+        results.append(result)
+        if args.json:
+            print(json.dumps(as_record(result), default=to_json), flush=True)
+            continue
+        timings = ['cached' if stage in result.cached else format_seconds(result.timings.get(stage))
+                   for stage in STAGES]
+        print(f'{result.filename:<{width}}  ' + '  '.join([f'{t:>9}' for t in timings + [format_seconds(result.total)]]) +
+              f'  {result.error or format_answers(result)}', flush=True)
+    wall_time = time.perf_counter() - start
+    for store in [cache, parse_cache]:
+        if store:
+            store.evict()
+
+    failed = [result for result in results if result.error]
+    if not args.json:
+        serial_time = sum([result.total for result in results])
+        print(f'\n{len(results)} input(s), {len(failed)} failed, wall time {format_seconds(wall_time)}, '
+              f'serial time {format_seconds(serial_time)}')
+        if results:
+            slowest = max(results, key=lambda r: r.total)
+            print(f'Slowest input is {slowest.filename} at {format_seconds(slowest.total)}')
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
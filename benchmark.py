@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import re
+import subprocess
+import sys
+import time
+from math import log
+from typing import Any, Callable, List, Optional, Tuple
+
+import baseline
+from generators import GENERATORS, generate
+from memory import MB
+from parsing import char_grid, digit_grid, ints, nested_list, pairs
+from runner import ROOT, DayResult, PARSE, PART_FUNCTIONS, find_day_modules, format_seconds, instrumented, solve
+from utils import np
+
+DEFAULT_SIZES = [0.25, 0.5, 1.0, 2.0, 4.0]
+DEFAULT_TIMEOUT = 120
+SUPER_LINEAR = 1.5
+PARSING_REPEATS = 5
+IMPORT_TIME = re.compile(r'^import time:\s+\d+ \|\s+(\d+) \| (\S.*)$')
+IMPORT_HARNESS = 'import importlib.util'
+LOAD_DAY = (IMPORT_HARNESS + '; spec = importlib.util.spec_from_file_location("day{day}", {path!r}); '
+            'spec.loader.exec_module(importlib.util.module_from_spec(spec))')
+
+
+class BenchmarkResult:
+    def __init__(self, day: int, scale: float, seed: int, lines: int = 0, chars: int = 0):
+        self.day = day
+        self.scale = scale
+        self.seed = seed
+        self.lines = lines
+        self.chars = chars
+        self.result: Optional[DayResult] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.result is not None and self.result.error is None
+
+    @property
+    def total(self):
+        return self.result.total if self.result else None
+
+
+def measure(day: int, scale: float, seed: int, memory: bool = True) -> BenchmarkResult:
+    data = generate(day, scale, seed)
+    bench = BenchmarkResult(day, scale, seed, len(data), sum([len(line) + 1 for line in data]))
+    bench.result = solve(day, data)
+    if memory and bench.ok:
+        traced = DayResult(day, bench.result.filename)
+        with instrumented(traced):
+            solve(day, data, traced, memory=True)
+        bench.result.traced, bench.result.sites = traced.traced, traced.sites
+    return bench
+
+
+def _measure_in_child(connection, *args):
+    connection.send(measure(*args))
+    connection.close()
+
+
+def measure_isolated(day: int, scale: float, seed: int, memory: bool = True,
+                     timeout: float = DEFAULT_TIMEOUT) -> BenchmarkResult:
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_measure_in_child, args=(sender, day, scale, seed, memory))
+    process.start()
+    try:
+        if receiver.poll(timeout):
+            return receiver.recv()
+        bench = BenchmarkResult(day, scale, seed)
+        bench.error = 'crashed' if not process.is_alive() else f'timed out after {timeout}s'
+        return bench
+    finally:
+        process.terminate()
+        process.join()
+
+
+def top_level_imports(code: str) -> List[Tuple[str, int]]:
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True, text=True)
+    return [(match.group(2), int(match.group(1))) for line in process.stderr.splitlines()
+            if (match := IMPORT_TIME.match(line))]
+
+
+def import_times(days: List[int]) -> List[Tuple[int, int, List[Tuple[str, int]]]]:
+    # Each day loads in a fresh interpreter, the way a new worker pays for it; whatever the
+    # interpreter and the loading harness import on their own is left out
+    startup = {name for name, _ in top_level_imports(IMPORT_HARNESS)}
+    paths = find_day_modules()
+    times = []
+    for day in days:
+        imports = [(name, micros) for name, micros in top_level_imports(LOAD_DAY.format(day=day, path=str(paths[day])))
+                   if name not in startup]
+        times.append((day, sum([micros for _, micros in imports]), sorted(imports, key=lambda i: -i[1])))
+    return times
+
+
+def report_import_times(times: List[Tuple[int, int, List[Tuple[str, int]]]]):
+    print(f"\nImport times\n{'Day':>3}  {'total':>9}  heaviest imports")
+    for day, total, imports in times:
+        print(f'{day:>3}  {total / 1000:>7.1f}ms  ' +
+              ', '.join([f'{name} {micros / 1000:.1f}ms' for name, micros in imports[:4]]))
+
+
+def _suffix_ints(line: str) -> List[int]:
+    # Day 15 before parsing.ints: every suffix starting at 'x=' or 'y=' was built, then the number in it evaled
+    values = []
+    for ind in range(2):
+        for marker in ['x=', 'y=']:
+            text = [line[i:] for i in range(len(line)) if line.startswith(marker, i)][ind][len(marker):]
+            values.append(eval(re.split('[,:]', text)[0]))
+    return values
+
+
+class ParsingCase:
+    def __init__(self, helper: str, day: int, scale: float, old: Callable[[List[str]], Any],
+                 new: Callable[[List[str]], Any]):
+        self.helper = helper
+        self.day = day
+        self.scale = scale
+        self.old = old
+        self.new = new
+
+
+# Each parsing.py helper next to the per-line code it replaced, run over a whole generated input
+PARSING_CASES = [
+    ParsingCase('nested_list', 13, 8.0, lambda data: [eval(line) for line in data if line],
+                lambda data: [nested_list(line) for line in data if line]),
+    ParsingCase('pairs', 14, 8.0, lambda data: [[eval(point) for point in line.split(' -> ')] for line in data],
+                lambda data: [pairs(line) for line in data]),
+    ParsingCase('ints', 15, 10.0, lambda data: [_suffix_ints(line) for line in data],
+                lambda data: [ints(line) for line in data]),
+    ParsingCase('ints', 16, 8.0, lambda data: [eval(line[line.index('=') + 1:line.index(';')]) for line in data],
+                lambda data: [ints(line)[0] for line in data]),
+    ParsingCase('digit_grid', 8, 16.0, lambda data: np.array([[int(c) for c in line] for line in data]),
+                lambda data: digit_grid(data).astype(int)),
+    ParsingCase('char_grid', 12, 16.0, lambda data: np.array([list(line) for line in data]), char_grid),
+]
+
+
+def best_time(func: Callable[[List[str]], Any], data: List[str]) -> Tuple[float, Any]:
+    best, value = None, None
+    for _ in range(PARSING_REPEATS):
+        start = time.perf_counter()
+        value = func(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, value
+
+
+def measure_parsing(days: Optional[List[int]] = None, seed: int = 0) -> List[Tuple[ParsingCase, int, float, float]]:
+    timings = []
+    for case in PARSING_CASES:
+        if days and case.day not in days:
+            continue
+        data = generate(case.day, case.scale, seed)
+        (old, expected), (new, value) = best_time(case.old, data), best_time(case.new, data)
+        if np.asarray(expected, dtype=object).tolist() != np.asarray(value, dtype=object).tolist():
+            raise AssertionError(f'{case.helper} parses day {case.day} differently from the code it replaced')
+        timings.append((case, len(data), old, new))
+    return timings
+
+
+def report_parsing(timings: List[Tuple[ParsingCase, int, float, float]]):
+    print(f"\nParsing helpers against the per-line code they replaced\n"
+          f"{'helper':>11}  {'day':>3}  {'scale':>5}  {'lines':>8}  {'old':>9}  {'new':>9}  {'speedup':>7}")
+    for case, lines, old, new in timings:
+        print(f'{case.helper:>11}  {case.day:>3}  {case.scale:>5}  {lines:>8}  {format_seconds(old):>9}  '
+              f'{format_seconds(new):>9}  {old / new:>6.1f}x')
+
+
+def growth(previous: BenchmarkResult, current: BenchmarkResult) -> Optional[float]:
+    if not (previous.ok and current.ok) or previous.total <= 0 or previous.scale == current.scale:
+        return None
+    return log(current.total / previous.total) / log(current.scale / previous.scale)
+
+
+def run_ladder(day: int, sizes: List[float], seed: int = 0, memory: bool = True,
+               timeout: float = DEFAULT_TIMEOUT) -> List[BenchmarkResult]:
+    results = []
+    for scale in sizes:
+        results.append(measure_isolated(day, scale, seed, memory, timeout))
+        if not results[-1].ok:
+            break
+    return results
+
+
+def report_ladder(day: int, results: List[BenchmarkResult]):
+    stages = [PARSE] + list(PART_FUNCTIONS.values())
+    print(f'\nDay {day}')
+    print(f"{'scale':>7}  {'lines':>8}  {'chars':>10}  " + '  '.join([f'{s:>9}' for s in stages + ['total']]) +
+          f"  {'RSS MB':>8}  {'traced MB':>9}  {'growth':>6}")
+    for i, bench in enumerate(results):
+        if bench.result is None:
+            print(f'{bench.scale:>7}  {bench.error}')
+            continue
+        timings = [format_seconds(bench.result.timings.get(stage)) for stage in stages] + [format_seconds(bench.total)]
+        rss, traced = [('-' if size is None else f'{size / MB:.1f}')
+                       for size in [bench.result.peak_rss, bench.result.peak_traced]]
+        exponent = growth(results[i - 1], bench) if i > 0 else None
+        print(f'{bench.scale:>7}  {bench.lines:>8}  {bench.chars:>10}  ' + '  '.join([f'{t:>9}' for t in timings]) +
+              f'  {rss:>8}  {traced:>9}  {"-" if exponent is None else f"{exponent:.2f}":>6}' +
+              (f'  {bench.result.error}' if bench.result.error else ''))
+
+    largest = next((bench for bench in reversed(results) if bench.ok and bench.result.sites), None)
+    if largest:
+        for stage, sites in largest.result.sites.items():
+            print(f'  top allocations in {stage} at scale {largest.scale}: ' +
+                  ', '.join([f'{os.path.basename(site)} ({size / MB:.1f}MB)' for site, size in sites[:3]]))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Benchmark the solvers over a ladder of generated input sizes')
+    parser.add_argument('days', nargs='*', type=int, help='days to benchmark (default: all)')
+    parser.add_argument('--sizes', nargs='+', type=float, default=DEFAULT_SIZES,
+                        help='input sizes as multiples of the puzzle input')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds allowed per run')
+    parser.add_argument('--import-times', action='store_true',
+                        help='also report what each day imports on a cold start')
+    parser.add_argument('--parsing', action='store_true',
+                        help='also time the parsing.py helpers against the per-line parsing they replaced')
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced run that finds peak allocations and their sites')
+    baseline.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    super_linear = []
+    entries: baseline.Baseline = {}
+    for day in args.days or sorted(GENERATORS):
+        results = run_ladder(day, sorted(args.sizes), args.seed, not args.no_memory, args.timeout)
+        report_ladder(day, results)
+        for bench in results:
+            if bench.ok:
+                values = baseline.metrics(bench.result.timings, bench.result.rss, bench.result.traced)
+                baseline.add_entry(entries, day, bench.scale, values)
+        exponents = [e for i in range(1, len(results)) if (e := growth(results[i - 1], results[i])) is not None]
+        if exponents and max(exponents) >= SUPER_LINEAR:
+            super_linear.append(f'{day} (x^{max(exponents):.2f})')
+    if super_linear:
+        print(f'\nSuper-linear growth: {", ".join(super_linear)}')
+    if args.import_times:
+        report_import_times(import_times(args.days or sorted(GENERATORS)))
+    if args.parsing:
+        report_parsing(measure_parsing(args.days, args.seed))
+    baseline.handle_arguments(args, entries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils import np
+
+CACHE_DIR = os.path.join('.cache', 'results')
+MAX_BYTES = 16 * 1024 * 1024
+PARSE_CACHE_DIR = os.path.join('.cache', 'parsed')
+PARSE_CACHE_ENV = 'AOC_PARSE_CACHE'
+PARSE_MAX_BYTES = 256 * 1024 * 1024
+ROOT = Path(__file__).resolve().parent
+
+
+def digest(*chunks: bytes) -> str:
+    sha = hashlib.sha256()
+    for chunk in chunks:
+        sha.update(hashlib.sha256(chunk).digest())
+    return sha.hexdigest()
+
+
+def input_digest(data: List[str]) -> str:
+    return digest('\n'.join(data).encode())
+
+
+def local_imports(path: Path) -> List[Path]:
+    tree = ast.parse(path.read_bytes())
+    names = [alias.name for node in ast.walk(tree) if isinstance(node, ast.Import) for alias in node.names]
+    names += [node.module for node in ast.walk(tree) if isinstance(node, ast.ImportFrom) and node.module]
+    return [ROOT / f'{name}.py' for name in names if (ROOT / f'{name}.py').is_file()]
+
+
+def local_sources(path: str) -> List[Path]:
+    # Every helper module a solver reaches, directly or through another helper, feeds its answers
+    sources, pending = [], [Path(path).resolve()]
+    while pending:
+        source = pending.pop()
+        if source not in sources:
+            sources.append(source)
+            pending.extend(local_imports(source))
+    return sources[:1] + sorted(sources[1:])
+
+
+@lru_cache(maxsize=None)
+def source_digest(path: str) -> str:
+    return digest(*[source.read_bytes() for source in local_sources(path)])
+
+
+def to_json(value: Any):
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f'{type(value).__name__} answers cannot be cached')
+
+
+class CacheDirectory:
+    SUFFIX = ''
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def entries(self, days: Optional[List[int]] = None) -> List[os.DirEntry]:
+        if not os.path.isdir(self.directory):
+            return []
+        prefixes = None if days is None else tuple([f'day{day}-' for day in days])
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith(self.SUFFIX) and
+                (prefixes is None or entry.name.startswith(prefixes))]
+
+    def size(self) -> int:
+        return sum([entry.stat().st_size for entry in self.entries()])
+
+    def evict(self) -> int:
+        entries = sorted(self.entries(), key=lambda e: e.stat().st_mtime)
+        total = sum([entry.stat().st_size for entry in entries])
+        evicted = 0
+        while entries and total > self.max_bytes:
+            entry = entries.pop(0)
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+            evicted += 1
+        return evicted
+
+    def invalidate(self, days: Optional[List[int]] = None) -> int:
+        entries = self.entries(days)
+        for entry in entries:
+            os.remove(entry.path)
+        return len(entries)
+
+
+class ResultCache(CacheDirectory):
+    SUFFIX = '.json'
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = MAX_BYTES):
+        super().__init__(directory, max_bytes)
+
+    def key(self, input_hash: str, source_hash: str, part: str) -> str:
+        return digest(input_hash.encode(), source_hash.encode(), part.encode())
+
+    def path(self, day: int, key: str) -> str:
+        return os.path.join(self.directory, f'day{day}-{key}.json')
+
+    def get(self, day: int, key: str) -> Tuple[bool, Any]:
+        path = self.path(day, key)
+        try:
+            with open(path, 'r') as f:
+                answer = json.load(f)['answer']
+        except (OSError, ValueError, KeyError):
+            return False, None
+        os.utime(path)
+        return True, answer
+
+    def put(self, day: int, key: str, answer: Any) -> bool:
+        try:
+            text = json.dumps({'day': day, 'answer': answer}, default=to_json)
+        except TypeError:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        # Workers write concurrently, so publish each entry with an atomic rename
+        path = self.path(day, key)
+        temp = f'{path}.{os.getpid()}.tmp'
+        with open(temp, 'w') as f:
+            f.write(text)
+        os.replace(temp, path)
+        return True
+
+
+class ParseCache(CacheDirectory):
+    # Parsed arrays live as one .npy per array so that warm runs can memory-map them
+    SUFFIX = '.npy'
+
+    def __init__(self, directory: str = PARSE_CACHE_DIR, max_bytes: int = PARSE_MAX_BYTES):
+        super().__init__(directory, max_bytes)
+
+    def array_path(self, day: str, key: str, name: str) -> str:
+        return os.path.join(self.directory, f'{day}-{key}-{name}.npy')
+
+    def load(self, day: str, key: str, names: List[str]) -> Optional[Dict[str, np.ndarray]]:
+        arrays = {}
+        for name in names:
+            path = self.array_path(day, key, name)
+            try:
+                # Copy-on-write, so solvers may scribble on what they get without touching the cache; the plain
+                # ndarray view skips memmap's slow per-item indexing
+                arrays[name] = np.asarray(np.load(path, mmap_mode='c', allow_pickle=False))
+            except (OSError, ValueError):
+                return None
+            os.utime(path)
+        return arrays
+
+    def store(self, day: str, key: str, arrays: Dict[str, np.ndarray]):
+        os.makedirs(self.directory, exist_ok=True)
+        for name, array in arrays.items():
+            path = self.array_path(day, key, name)
+            temp = f'{path}.{os.getpid()}.tmp'
+            with open(temp, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+            os.replace(temp, path)
+
+    def arrays(self, source: str, data: List[str], names: List[str],
+               build: Callable[[], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        day = Path(source).stem.split()[0].lower()
+        key = digest(input_digest(data).encode(), source_digest(source).encode())
+        arrays = self.load(day, key, names)
+        if arrays is None:
+            arrays = build()
+            self.store(day, key, arrays)
+        return arrays
+
+
+def parse_cache() -> Optional[ParseCache]:
+    directory = os.environ.get(PARSE_CACHE_ENV)
+    return ParseCache(directory) if directory else None
+
+
+def enable_parse_cache(directory: str = PARSE_CACHE_DIR):
+    # The environment carries the setting into worker processes however they are started
+    os.environ[PARSE_CACHE_ENV] = directory
+
+
+def cached_arrays(source: str, data: List[str], names: List[str],
+                  build: Callable[[], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    # Opt-in: unless a parse cache is enabled this is just build()
+    cache = parse_cache()
+    return build() if cache is None else cache.arrays(source, data, names, build)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Inspect or clear the cached solver results and parsed inputs')
+    parser.add_argument('command', choices=['info', 'invalidate'])
+    parser.add_argument('days', nargs='*', type=int, help='days to invalidate (default: all)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--parse-cache-dir', default=PARSE_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    caches = [('cached result(s)', ResultCache(args.cache_dir)), ('parsed array(s)', ParseCache(args.parse_cache_dir))]
+    for label, cache in caches:
+        if args.command == 'invalidate':
+            print(f'Removed {cache.invalidate(args.days or None)} {label} from {cache.directory}')
+        else:
+            print(f'{len(cache.entries())} {label}, {cache.size() / 1024:.1f}KB in {cache.directory}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+
+# Every rerun pays for this module's imports, so it sticks to the few the request needs and parses argv by hand
+SOCKET_ENV = 'AOC_SOLVER_SOCKET'
+SOCKET_PATH = os.path.join('.cache', 'solver.sock')
+PING = 'ping'
+SOLVE = 'solve'
+STOP = 'stop'
+USAGE = '''usage: python client.py DAY [INPUT | -] [--part {1,2}]... [--json]
+                        [--time-budget SECONDS] [--node-budget NODES]
+       python client.py ping | stop
+
+Solves on the server started with python daemon.py. INPUT defaults to the day's FILENAME, '-' reads stdin.
+The socket is $AOC_SOLVER_SOCKET, or .cache/solver.sock.'''
+
+
+def default_socket() -> str:
+    return os.environ.get(SOCKET_ENV, SOCKET_PATH)
+
+
+def send(request: dict, path: str | None = None) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path or default_socket())
+        client.sendall(json.dumps(request).encode() + b'\n')
+        with client.makefile('rb') as reader:
+            return json.loads(reader.readline())
+
+
+def solve_request(args: list) -> tuple:
+    request = {'command': SOLVE, 'day': int(args[0]), 'cwd': os.getcwd(), 'parts': []}
+    as_json = False
+    rest = iter(args[1:])
+    for arg in rest:
+        if arg == '--part':
+            request['parts'].append(int(next(rest)))
+        elif arg == '--json':
+            as_json = True
+        elif arg == '--time-budget':
+            request['time_budget'] = float(next(rest))
+        elif arg == '--node-budget':
+            request['node_budget'] = int(next(rest))
+        elif arg == '-':
+            request['text'] = sys.stdin.read()
+        elif not arg.startswith('--') and 'path' not in request:
+            request['path'] = os.path.abspath(arg)
+        else:
+            raise ValueError(f'unexpected argument {arg!r}')
+    return request, as_json
+
+
+def print_result(response: dict):
+    for part, answer in response.get('answers', {}).items():
+        answer = f'\n{answer}' if isinstance(answer, str) and '\n' in answer else answer
+        print(f"Day {response['day']} part {part}: {answer}")
+    timings = ', '.join([f'{stage} {seconds:.4f}s' for stage, seconds in response.get('timings', {}).items()])
+    cached = ', '.join(response.get('cached', []))
+    print(f'({timings or "no timings"}' + (f'; cached {cached}' if cached else '') + ')', file=sys.stderr)
+
+
+def main(argv: list | None = None):
+    args = sys.argv[1:] if argv is None else argv
+    if not args or args[0] in ('-h', '--help'):
+        print(USAGE)
+        return
+    try:
+        request, as_json = solve_request(args) if args[0] not in (PING, STOP) else ({'command': args[0]}, True)
+    except (ValueError, StopIteration) as e:
+        raise SystemExit(f'{str(e) or "missing value"}\n{USAGE}')
+    try:
+        response = send(request)
+    except OSError as e:
+        raise SystemExit(f'no solver server on {default_socket()} ({e.strerror}); start one with: python daemon.py')
+    if as_json:
+        print(json.dumps(response))
+    else:
+        print_result(response)
+    if response.get('error'):
+        print(response['error'], file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
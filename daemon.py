@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import time
+from typing import Any, Dict, List, Optional
+
+from batch import as_record
+from cache import ResultCache, enable_parse_cache, source_digest, to_json
+from client import PING, SOCKET_ENV, SOCKET_PATH, SOLVE, STOP, default_socket
+from runner import READ, DayResult, find_day_modules, load_day, solve, unload_day
+from utils import read_file, split_lines, Budget, Part
+
+CONNECT_TIMEOUT = 1.0
+
+Request = Dict[str, Any]
+Response = Dict[str, Any]
+
+
+class SolverServer(socketserver.UnixStreamServer):
+    # Requests are handled one at a time; the solvers share the PHASES and PROGRESS singletons
+    def __init__(self, path: str, cache=None):
+        self.cache = cache
+        self.stopping = False
+        self.started = time.time()
+        self.solved = 0
+        self.loaded: Dict[int, int] = {}
+        super().__init__(path, SolverHandler)
+
+    def warm_up(self):
+        for day in find_day_modules():
+            self.load(day)
+
+    def load(self, day: int):
+        # Editing a solver while the server runs should not leave it answering with the old code
+        path = find_day_modules()[day]
+        mtime = path.stat().st_mtime_ns
+        if self.loaded.get(day) not in (None, mtime):
+            unload_day(day)
+            source_digest.cache_clear()
+        module = load_day(day)
+        self.loaded[day] = mtime
+        return module
+
+    def solve(self, request: Request) -> Response:
+        day = int(request['day'])
+        module = self.load(day)
+        filename = request.get('path') or os.path.join(request.get('cwd', ''), module.FILENAME)
+        result = DayResult(day, filename if 'text' not in request else '<stdin>')
+        try:
+            data = split_lines(request['text']) if 'text' in request else result.timed(READ, read_file, filename)
+        except OSError as e:
+            result.error = f'{type(e).__name__}: {e}'
+            return as_record(result)
+        seconds, nodes = request.get('time_budget'), request.get('node_budget')
+        budget = Budget(seconds, nodes) if seconds is not None or nodes is not None else None
+        parts = [Part(str(part)) for part in request.get('parts') or []]
+        solve(day, data, result, cache=self.cache, budget=budget, parts=parts)
+        self.solved += 1
+        return as_record(result)
+
+    def handle_request_data(self, request: Request) -> Response:
+        command = request.get('command', SOLVE)
+        if command == PING:
+            return {'pid': os.getpid(), 'uptime': time.time() - self.started, 'solved': self.solved,
+                    'days': sorted(self.loaded)}
+        if command == STOP:
+            self.stopping = True
+            return {'stopping': True}
+        if command == SOLVE:
+            return self.solve(request)
+        return {'error': f'unknown command {command!r}'}
+
+
+class SolverHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.handle_request_data(json.loads(line))
+            except Exception as e:
+                response = {'error': f'{type(e).__name__}: {e}'}
+            self.wfile.write(json.dumps(response, default=to_json).encode() + b'\n')
+            self.wfile.flush()
+
+
+def is_running(path: str) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+def serve(path: str, cache_dir: Optional[str] = None, parse_cache_dir: Optional[str] = None):
+    if is_running(path):
+        raise SystemExit(f'a solver server is already listening on {path}')
+    if os.path.exists(path):
+        os.remove(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if parse_cache_dir:
+        enable_parse_cache(parse_cache_dir)
+    cache = ResultCache(cache_dir) if cache_dir else None
+
+    # Only the owner may connect, since the server reads any file a request names
+    old_umask = os.umask(0o077)
+    try:
+        server = SolverServer(path, cache)
+    finally:
+        os.umask(old_umask)
+    start = time.perf_counter()
+    server.warm_up()
+    print(f'Loaded {len(server.loaded)} days in {time.perf_counter() - start:.2f}s, listening on {path}', flush=True)
+    try:
+        while not server.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(path)
+        if cache:
+            cache.evict()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Keep every solver loaded and answer client.py over a Unix socket')
+    parser.add_argument('--socket', default=default_socket(),
+                        help=f'socket path (default: ${SOCKET_ENV} or {SOCKET_PATH})')
+    parser.add_argument('--cache-dir', help='also keep answers in this result cache directory')
+    parser.add_argument('--parse-cache-dir', help='keep parsed grids as .npy files in this directory')
+    args = parser.parse_args(argv)
+    serve(args.socket, args.cache_dir, args.parse_cache_dir)
+
+
+if __name__ == '__main__':
+    main()
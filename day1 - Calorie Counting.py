@@ -1,23 +1,35 @@
-from typing import List
-from itertools import groupby
-from pydantic import BaseModel
-from utils import read_file
+from typing import Iterable, List
+from utils import iter_groups, iter_lines
 
+FILENAME = 'input/day1.txt'
 
-class Elf(BaseModel):
-    items: List[int] = []
+
+class Elf:
+    __slots__ = ('items',)
+
+    def __init__(self, items: Iterable[str]):
+        self.items = [int(item) for item in items]
 
     @property
     def total_calories(self):
         return sum(self.items)
 
 
-if __name__ == '__main__':
-    filename = 'input/day1.txt'
-    data = read_file(filename)
+def parse(data: Iterable[str]):
+    elves = [Elf(group) for group in iter_groups(data)]
+    return sorted([elf.total_calories for elf in elves], reverse=True)
+
+
+def part1(sorted_calorie_counts: List[int]):
+    return sorted_calorie_counts[0]
 
-    elves = [Elf(items=list(group)) for not_blank, group in groupby(data, key=bool) if not_blank]
-    sorted_calorie_counts = sorted([elf.total_calories for elf in elves], reverse=True)
 
-    print(f"The answer to part 1 is {sorted_calorie_counts[0]}")
-    print(f"The answer to part 2 is {sum(sorted_calorie_counts[:3])}")
+def part2(sorted_calorie_counts: List[int]):
+    return sum(sorted_calorie_counts[:3])
+
+
+if __name__ == '__main__':
+    sorted_calorie_counts = parse(iter_lines(FILENAME))
+
+    print(f"The answer to part 1 is {part1(sorted_calorie_counts)}")
+    print(f"The answer to part 2 is {part2(sorted_calorie_counts)}")
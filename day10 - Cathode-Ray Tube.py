@@ -2,24 +2,26 @@ from enum import Enum
 from typing import List, Optional
 
 import math
-from pydantic import BaseModel
 
 from utils import read_file
 
+FILENAME = 'input/day10.txt'
+
 
 class InstType(str, Enum):
     ADDX = 'addx'
     NOOP = 'noop'
 
 
-class Instruction(BaseModel):
-    inst_type: InstType
-    value: Optional[int]
+class Instruction:
+    __slots__ = ('inst_type', 'value')
 
     def __init__(self, text: str):
         words = text.split()
-        super().__init__(inst_type=words[0],
-                         value=words[1] if len(words) == 2 else None)
+        self.inst_type = InstType(words[0])
+        if len(words) != (2 if self.inst_type == InstType.ADDX else 1):
+            raise ValueError(f'malformed instruction {text!r}')
+        self.value: Optional[int] = int(words[1]) if self.inst_type == InstType.ADDX else None
 
 
 class CPU:
@@ -59,8 +61,12 @@ class CPU:
     def __get_crt_row(self, row: int):
         return "".join([self.crt[i + row * self.CRT_WIDTH] for i in range(self.CRT_WIDTH)])
 
+    @property
+    def answer_pt2(self):
+        return "\n".join([self.__get_crt_row(row) for row in range(self.CRT_HEIGHT)])
+
     def draw_crt(self):
-        [print(self.__get_crt_row(row)) for row in range(self.CRT_HEIGHT)]
+        print(self.answer_pt2)
 
     def __get_row_and_col(self, cycle):
         row = math.floor((cycle - 1) // self.CRT_WIDTH)
@@ -85,13 +91,23 @@ class CPU:
                     self.__draw_pixel()
 
 
-if __name__ == '__main__':
-    filename = 'input/day10.txt'
-    data = read_file(filename)
-
+def parse(data: List[str]):
     cpu = CPU(data)
     cpu.process_instructions()
-    print(f"The answer to Pt 1 is {cpu.answer_pt1}")
+    return cpu
+
+
+def part1(cpu: CPU):
+    return cpu.answer_pt1
+
+
+def part2(cpu: CPU):
+    return cpu.answer_pt2
+
+
+if __name__ == '__main__':
+    cpu = parse(read_file(FILENAME))
+    print(f"The answer to Pt 1 is {part1(cpu)}")
 
     print(f"\nThe answer to Pt 2 is:")
-    cpu.draw_crt()
+    print(part2(cpu))
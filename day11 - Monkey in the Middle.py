@@ -1,12 +1,11 @@
-import numpy as np
+from collections import deque
 from enum import Enum
-from typing import List, Union
-from queue import Queue
-from math import floor
+from typing import Deque, List, Union
+from math import prod
 
-from pydantic import BaseModel
+from utils import read_file, find_cycle, np
 
-from utils import read_file
+FILENAME = 'input/day11.txt'
 
 
 class Symbol(str, Enum):
@@ -18,117 +17,173 @@ class OldEnum(str, Enum):
     OLD = 'old'
 
 
-class Operation(BaseModel):
-    second_arg: Union[OldEnum, int]
-    symbol: Symbol
+class Operation:
+    __slots__ = ('second_arg', 'symbol', 'uses_old', 'adds')
 
     def __init__(self, text: str):
         words = text.split()
-        super().__init__(second_arg=words[5], symbol=words[4])
+        self.symbol = Symbol(words[4])
+        self.second_arg: Union[OldEnum, int] = OldEnum.OLD if words[5] == OldEnum.OLD else int(words[5])
+        self.uses_old = self.second_arg == OldEnum.OLD
+        self.adds = self.symbol == Symbol.PLUS
 
+    def apply(self, worry_level: int) -> int:
+        arg = worry_level if self.uses_old else self.second_arg
+        return worry_level + arg if self.adds else worry_level * arg
 
-class Item(BaseModel):
-    worry_level: int
-
-    def adjust_worry_level(self, operation: Operation):
-        if operation.symbol == Symbol.PLUS:
-            if operation.second_arg == OldEnum.OLD:
-                self.worry_level *= 2
-            else:
-                self.worry_level += operation.second_arg
-        else:
-            if operation.second_arg == OldEnum.OLD:
-                self.worry_level **= 2
-            else:
-                self.worry_level *= operation.second_arg
 
-
-class Test(BaseModel):
-    divisible_by: int
-    true_monkey: int
-    false_monkey: int
+class Test:
+    __slots__ = ('divisible_by', 'true_monkey', 'false_monkey')
 
     def __init__(self, lines: List[str]):
-        words = lines[0].split()
-        tm, fm = lines[1].split()[5], lines[2].split()[5]
-        super().__init__(divisible_by=words[3], true_monkey=tm, false_monkey=fm)
-
+        self.divisible_by = int(lines[0].split()[3])
+        self.true_monkey = int(lines[1].split()[5])
+        self.false_monkey = int(lines[2].split()[5])
 
-class Monkey(BaseModel):
-    worry_level_divisor: int
-    items: Queue
-    operation: Operation
-    test: Test
-    inspected: int = 0
 
-    class Config:
-        arbitrary_types_allowed = True
+class Monkey:
+    __slots__ = ('worry_level_divisor', 'items', 'operation', 'test', 'inspected')
 
     def __init__(self, lines: List[str], worry_level_divisor: int):
-        queue = Queue()
-        [queue.put(Item(worry_level=wl)) for wl in lines[0].split(':')[1].split(',')]
-        oper = Operation(text=lines[1])
-        test = Test(lines=lines[2:5])
-        super().__init__(worry_level_divisor=worry_level_divisor, items=queue, operation=oper, test=test)
+        self.worry_level_divisor = worry_level_divisor
+        self.items: Deque[int] = deque([int(wl) for wl in lines[0].split(':')[1].split(',')])
+        self.operation = Operation(lines[1])
+        self.test = Test(lines[2:5])
+        self.inspected = 0
 
     @property
     def worry_levels(self):
-        return [self.items.queue[i] for i in range(self.items.qsize())]
+        return list(self.items)
 
     def play_with_item(self, cycle_number: int):
         self.inspected += 1
-        item = self.items.get()
-        item.adjust_worry_level(self.operation)
+        worry_level = self.operation.apply(self.items.popleft())
         if self.worry_level_divisor > 1:
-            item.worry_level //= self.worry_level_divisor
+            worry_level //= self.worry_level_divisor
         else:
-            num_cycles = floor(item.worry_level/cycle_number)
-            item.worry_level -= num_cycles * cycle_number
-        target_monkey = self.test.true_monkey if self.__test(item.worry_level) else \
+            worry_level %= cycle_number
+        target_monkey = self.test.true_monkey if self.__test(worry_level) else \
             self.test.false_monkey
-        return target_monkey, item
+        return target_monkey, worry_level
 
     def __test(self, worry_level: int):
-        return True if worry_level % self.test.divisible_by == 0 else False
+        return worry_level % self.test.divisible_by == 0
 
 
 class MonkeyInTheMiddle:
     LINES_PER = 7
+    # Worry levels below this square without overflowing int64
+    ARRAY_LIMIT = 3_037_000_499
+    # Fewer items than this play faster one at a time than as arrays
+    ARRAY_MIN_ITEMS = 64
+    # Past this share of the rounds, searching items for cycles costs more than playing every round
+    CYCLE_SHARE = 0.25
 
     def __init__(self, lines: List[str], worry_level_divisor: int):
         self.num_monkeys = (len(lines) + 1)//self.LINES_PER
         self.monkeys = [Monkey(lines[self.LINES_PER*i+1:self.LINES_PER*i+self.LINES_PER-1],
                                worry_level_divisor) for
                         i in range(self.num_monkeys)]
-        self.cycle_number = int(np.prod([m.test.divisible_by for m in self.monkeys]))
+        self.cycle_number = prod([m.test.divisible_by for m in self.monkeys])
 
     @property
     def answer_pt1(self):
-        return np.prod(sorted(self.monkey_activity, reverse=True)[:2])
+        return prod(sorted(self.monkey_activity, reverse=True)[:2])
 
     @property
     def monkey_activity(self):
         return [m.inspected for m in self.monkeys]
 
     def play_rounds(self, rounds: int):
+        if self.monkeys and self.monkeys[0].worry_level_divisor == 1 and self.play_item_cycles(rounds):
+            return
+        # Without the divisor worry levels stay below the cycle number, so whole queues can be played as arrays
+        num_items = sum([len(monkey.items) for monkey in self.monkeys])
+        if self.monkeys and self.monkeys[0].worry_level_divisor == 1 and self.cycle_number <= self.ARRAY_LIMIT \
+                and num_items >= self.ARRAY_MIN_ITEMS:
+            self.play_array_rounds(rounds)
+            return
         for i in range(rounds):
             self.play_round()
 
+    def play_item_cycles(self, rounds: int) -> bool:
+        # Items never affect each other, and each one has few enough states that its rounds soon repeat
+        cycles = []
+        for num, monkey in enumerate(self.monkeys):
+            for worry_level in monkey.items:
+                cycle = find_cycle(self.play_item_round, (num, worry_level, ()), key=lambda state: state[:2],
+                                   value=lambda state: state, limit=int(rounds * self.CYCLE_SHARE))
+                if cycle is None:
+                    return False
+                cycles.append(cycle)
+        items = [deque() for _ in self.monkeys]
+        for cycle in cycles:
+            # A round played from step s gives the state at step s + 1, along with the monkeys that inspected it
+            for step in range(min(rounds, cycle.start + cycle.length)):
+                times = 1 if step < cycle.start else len(range(step, rounds, cycle.length))
+                for num in cycle.values[step + 1][2]:
+                    self.monkeys[num].inspected += times
+            num, worry_level, _ = cycle.values[cycle.equivalent_step(rounds)]
+            items[num].append(worry_level)
+        for monkey, queue in zip(self.monkeys, items):
+            monkey.items = queue
+        return True
+
+    def play_item_round(self, state):
+        # An item thrown to a later monkey is played again in the same round
+        num, worry_level, _ = state
+        inspected_by = []
+        while True:
+            monkey = self.monkeys[num]
+            inspected_by.append(num)
+            worry_level = monkey.operation.apply(worry_level) % self.cycle_number
+            target = monkey.test.true_monkey if worry_level % monkey.test.divisible_by == 0 else monkey.test.false_monkey
+            if target <= num:
+                return target, worry_level, tuple(inspected_by)
+            num = target
+
+    def play_array_rounds(self, rounds: int):
+        empty = np.zeros(0, dtype=np.int64)
+        queues = [np.array(monkey.items, dtype=np.int64) for monkey in self.monkeys]
+        for i in range(rounds):
+            for num, monkey in enumerate(self.monkeys):
+                worry_levels = queues[num]
+                if not len(worry_levels):
+                    continue
+                monkey.inspected += len(worry_levels)
+                worry_levels = monkey.operation.apply(worry_levels) % self.cycle_number
+                passed = worry_levels % monkey.test.divisible_by == 0
+                true_monkey, false_monkey = monkey.test.true_monkey, monkey.test.false_monkey
+                queues[true_monkey] = np.concatenate((queues[true_monkey], worry_levels[passed]))
+                queues[false_monkey] = np.concatenate((queues[false_monkey], worry_levels[~passed]))
+                queues[num] = empty
+        for monkey, queue in zip(self.monkeys, queues):
+            monkey.items = deque(queue.tolist())
+
     def play_round(self):
         for num, monkey in enumerate(self.monkeys):
-            while monkey.items.qsize() > 0:
-                target_monkey, item = monkey.play_with_item(self.cycle_number)
-                self.monkeys[target_monkey].items.put(item)
+            while monkey.items:
+                target_monkey, worry_level = monkey.play_with_item(self.cycle_number)
+                self.monkeys[target_monkey].items.append(worry_level)
 
 
-if __name__ == '__main__':
-    filename = 'input/day11.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return data
+
 
+def part1(data: List[str]):
     monkey_in_the_middle = MonkeyInTheMiddle(data, worry_level_divisor=3)
     monkey_in_the_middle.play_rounds(rounds=20)
-    print(f"The answer to Pt 1 is {monkey_in_the_middle.answer_pt1}")
+    return monkey_in_the_middle.answer_pt1
+
 
+def part2(data: List[str]):
     monkey_in_the_middle = MonkeyInTheMiddle(data, worry_level_divisor=1)
     monkey_in_the_middle.play_rounds(rounds=10_000)
-    print(f"The answer to Pt 1 is {monkey_in_the_middle.answer_pt1}")
+    return monkey_in_the_middle.answer_pt1
+
+
+if __name__ == '__main__':
+    data = parse(read_file(FILENAME))
+    print(f"The answer to Pt 1 is {part1(data)}")
+    print(f"The answer to Pt 2 is {part2(data)}")
@@ -4,8 +4,10 @@ from typing import List, Union
 import numpy as np
 from functools import total_ordering
 
-from utils import read_file
+from parsing import nested_list
+from utils import read_file, phase
 
+FILENAME = 'input/day13.txt'
 RIGHT_BRACKET = ']'
 LEFT_BRACKET = '['
 COMMA = ','
@@ -55,31 +57,43 @@ class Packet:
 
 class Pair:
     def __init__(self, data: List[str]):
-        self.left = Packet(eval(data[0]))
-        self.right = Packet(eval(data[1]))
+        self.left = Packet(nested_list(data[0]))
+        self.right = Packet(nested_list(data[1]))
 
 
 class DistressSignal:
     DIVIDER_PACKETS = [Packet([[2]]), Packet([[6]])]
 
     def __init__(self, data: List[str]):
-        self.pairs = [Pair([data[3*i], data[3*i+1]]) for i in range(len(data)//3+1)]
-        self.packets = [Packet(eval(data[i])) for i in range(len(data)) if data[i]]
+        with phase('parse'):
+            self.pairs = [Pair([data[3*i], data[3*i+1]]) for i in range(len(data)//3+1)]
+            self.packets = [Packet(nested_list(data[i])) for i in range(len(data)) if data[i]]
 
     @property
     def answer_pt1(self):
-        return sum([i+1 for i, pair in enumerate(self.pairs) if pair.left < pair.right])
+        with phase('compare'):
+            return sum([i+1 for i, pair in enumerate(self.pairs) if pair.left < pair.right])
 
     @property
     def answer_pt2(self):
-        return np.prod([sorted(self.packets + self.DIVIDER_PACKETS).index(packet) + 1 for
-                        packet in self.DIVIDER_PACKETS])
+        with phase('sort'):
+            return np.prod([sorted(self.packets + self.DIVIDER_PACKETS).index(packet) + 1 for
+                            packet in self.DIVIDER_PACKETS])
 
 
-if __name__ == '__main__':
-    filename = 'input/day13.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return DistressSignal(data)
+
+
+def part1(distress_signal: DistressSignal):
+    return distress_signal.answer_pt1
+
 
-    distress_signal = DistressSignal(data)
-    print(f"The answer to Pt 1 is {distress_signal.answer_pt1}")
-    print(f"The answer to Pt 2 is {distress_signal.answer_pt2}")
+def part2(distress_signal: DistressSignal):
+    return distress_signal.answer_pt2
+
+
+if __name__ == '__main__':
+    distress_signal = parse(read_file(FILENAME))
+    print(f"The answer to Pt 1 is {part1(distress_signal)}")
+    print(f"The answer to Pt 2 is {part2(distress_signal)}")
@@ -1,13 +1,13 @@
 from __future__ import annotations
 from enum import Enum
 from typing import List, Union
-import numpy as np
-import pandas as pd
+from math import isnan, nan
 
-from utils import read_file, XYPair, Part
+from parsing import pairs
+from utils import read_file, phase, DenseGrid, XYPair, Part
 
-SIZE = 1000
-DELIMITER = ' -> '
+FILENAME = 'input/day14.txt'
+SOURCE = XYPair((0, 500))
 
 
 class Occupant(str, Enum):
@@ -19,49 +19,57 @@ class Sand:
     def __init__(self, xypair: XYPair):
         self.pos = xypair
 
-    def __get_occupants(self, grid: np.array):
-        return [grid[self.pos.x+1, y] for y in range(self.pos.y-1, self.pos.y+2)]
+    def __get_occupants(self, grid: DenseGrid):
+        return [grid.get(self.pos.x+1, y) for y in range(self.pos.y-1, self.pos.y+2)]
 
-    def is_blocked(self, grid: np.array) -> bool:
+    def is_blocked(self, grid: DenseGrid) -> bool:
         occupants = self.__get_occupants(grid)
-        return sum([pd.isna(occupant) for occupant in occupants]) == 0
+        return sum([isnan(occupant) for occupant in occupants]) == 0
 
-    def get_new_pos(self, grid: np.array) -> Union[None, XYPair]:
-        options = [XYPair((self.pos.x+1, y)) for y in range(self.pos.y-1, self.pos.y+2)]
-        occupants = self.__get_occupants(grid)
-        return options[1] if pd.isna(occupants[1]) else \
-            options[0] if pd.isna(occupants[0]) else \
-            options[2] if pd.isna(occupants[2]) else \
-            None
+    def get_new_pos(self, grid: DenseGrid) -> Union[None, XYPair]:
+        # Straight down is tried first and is usually free, so the diagonals are only read when it is not
+        for y in (self.pos.y, self.pos.y-1, self.pos.y+1):
+            if isnan(grid.get(self.pos.x+1, y)):
+                return XYPair((self.pos.x+1, y))
+        return None
 
 
 class Reservoir:
     def __init__(self, data: List[str], part: Part):
         self.part = part
         self.data = data
-        self.sand = Sand(XYPair((0, 500)))
-        self.segments = self.__get_segments()
-        self.max_depth = max([segment[0].x for segment in self.segments])
+        with phase('parse'):
+            self.segments = self.__get_segments()
+        self.max_depth = max([max(segment[0].x, segment[1].x) for segment in self.segments])
         if part == Part.PT2:
-            self.segments.append((XYPair((self.max_depth + 2, 0)),
-                                  XYPair((self.max_depth + 2, SIZE - 1))))
+            # Sand piles up at most one column wider per row, so the floor only has to span that far
+            floor = self.max_depth + 2
+            self.segments.append((XYPair((floor, SOURCE.y - floor)),
+                                  XYPair((floor, SOURCE.y + floor))))
             self.max_depth += 2
-        self.grid = np.nan*np.zeros((self.max_depth + 1, SIZE))
-        self.__add_rocks()
+        # Sand spreads at most one column per row, so the source's reach and the rocks bound the grid up front
+        # and every read the sand makes can take the grid's unchecked path
+        low = min([min(a.y, b.y) for a, b in self.segments] + [SOURCE.y - self.max_depth]) - 1
+        high = max([max(a.y, b.y) for a, b in self.segments] + [SOURCE.y + self.max_depth]) + 1
+        with phase('precompute'):
+            self.grid = DenseGrid(fill=nan, shape=(self.max_depth + 1, high - low + 1), origin=(0, low))
+            self.__add_rocks()
+        self.sand = Sand(XYPair(SOURCE.coordinates))
 
     @property
     def answer(self):
         if self.part == Part.PT1:
-            return np.count_nonzero(self.grid == 0) - 1
+            return self.grid.count(0) - 1
         else:
-            return np.count_nonzero(self.grid == 0) + 1
+            return self.grid.count(0) + 1
 
     def process(self):
-        falling_into_abyss = False
-        self.sand = Sand(XYPair((0, 500)))
-        while not falling_into_abyss and not self.sand.is_blocked(self.grid):
-            falling_into_abyss = self.fall()
-            self.sand = Sand(XYPair((0, 500)))
+        with phase('simulate'):
+            falling_into_abyss = False
+            self.sand = Sand(XYPair(SOURCE.coordinates))
+            while not falling_into_abyss and not self.sand.is_blocked(self.grid):
+                falling_into_abyss = self.fall()
+                self.sand = Sand(XYPair(SOURCE.coordinates))
 
     def fall(self):
         new_pos = self.sand.get_new_pos(self.grid)
@@ -80,19 +88,28 @@ class Reservoir:
     def __get_segments(self):
         segments = []
         for line in self.data:
-            points = [XYPair(eval(point)).swap() for point in line.split(DELIMITER)]
+            points = [XYPair(point).swap() for point in pairs(line)]
             segments.extend([(points[i], points[i+1]) for i in range(len(points)-1)])
         return segments
 
 
-if __name__ == '__main__':
-    filename = 'input/day14.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return data
 
+
+def part1(data: List[str]):
     reservoir = Reservoir(data, Part.PT1)
     reservoir.process()
-    print(f"The answer to Pt 1 is {reservoir.answer}")
+    return reservoir.answer
+
 
+def part2(data: List[str]):
     reservoir = Reservoir(data, Part.PT2)
     reservoir.process()
-    print(f"The answer to Pt 2 is {reservoir.answer}")
+    return reservoir.answer
+
+
+if __name__ == '__main__':
+    data = parse(read_file(FILENAME))
+    print(f"The answer to Pt 1 is {part1(data)}")
+    print(f"The answer to Pt 2 is {part2(data)}")
@@ -3,7 +3,10 @@ from typing import List, Tuple
 import numpy as np
 import itertools as it
 
-from utils import read_file, Graph, GraphNode
+from parsing import ints
+from utils import read_file, phase, Graph, GraphNode, PROGRESS
+
+FILENAME = 'input/day16.txt'
 
 
 class Valve:
@@ -13,17 +16,19 @@ class Valve:
         self.adj_valves = line[line.index("valves ")+7:].split() if 'valves' in line else \
             line[line.index("valve ") + 6:].split()
         self.adj_valves = [v.replace(',', '') for v in self.adj_valves]
-        self.flow_rate = eval(line[line.index('=')+1:line.index(';')])
+        self.flow_rate = ints(line)[0]
 
 
 class Tunnels:
     def __init__(self, data: List[str]):
-        self.valves = [Valve(i, line) for i, line in enumerate(data)]
+        with phase('parse'):
+            self.valves = [Valve(i, line) for i, line in enumerate(data)]
         self.name_to_id = {v.name: i for i, v in enumerate(self.valves)}
         self.nodes = [(GraphNode(i, [self.name_to_id[n] for n in v.adj_valves])) for i, v in enumerate(self.valves)]
-        self.graph = Graph(self.nodes, np.logical_not(np.identity(len(self.nodes))).astype(int))
-        self.graph.find_all_shortest_paths()
-        self.shortest_paths = self.__shortest_paths()
+        with phase('precompute'):
+            self.graph = Graph(self.nodes, np.logical_not(np.identity(len(self.nodes))).astype(int))
+            self.graph.find_all_shortest_paths()
+            self.shortest_paths = self.__shortest_paths()
         self.visited_states = {}
 
     @staticmethod
@@ -36,16 +41,19 @@ class Tunnels:
         return res_list
 
     def find_max_with_elephant(self):
-        permutations = self.two_partitions(set([v for v in tunnels.shortest_paths if v != 'AA']))
+        permutations = self.two_partitions(set([v for v in self.shortest_paths if v != 'AA']))
         maxval = 0
         for i, p in enumerate(permutations):
-            maxval = max(maxval, tunnels.find_max(26, 'AA', tuple(p[0])) + tunnels.find_max(26, 'AA', tuple(p[1])))
+            PROGRESS.tick('partitions')
+            maxval = max(maxval, self.find_max(26, 'AA', tuple(p[0])) + self.find_max(26, 'AA', tuple(p[1])))
+            PROGRESS.improve('pressure', maxval)
         return maxval
 
     def find_max(self, time: int, valve: str, valves: Tuple[str]):
         if (time, valve, valves) in self.visited_states:
             return self.visited_states[(time, valve, valves)]
 
+        PROGRESS.tick('states')
         maxval = 0
         for target in self.shortest_paths[valve]:
             if target in valves:
@@ -74,12 +82,23 @@ class Tunnels:
         return next(iter(v for v in self.valves if v.name == name))
 
 
-if __name__ == '__main__':
-    filename = 'input/day16.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return data
 
+
+def part1(data: List[str]):
     tunnels = Tunnels(data)
-    print(f'The answer to part 1 is {tunnels.find_max(30, "AA", ())}')
+    with phase('search'):
+        return tunnels.find_max(30, "AA", ())
+
 
+def part2(data: List[str]):
     tunnels = Tunnels(data)
-    print(f'The answer to part 2 is {tunnels.find_max_with_elephant()}')
+    with phase('search'):
+        return tunnels.find_max_with_elephant()
+
+
+if __name__ == '__main__':
+    data = parse(read_file(FILENAME))
+    print(f'The answer to part 1 is {part1(data)}')
+    print(f'The answer to part 2 is {part2(data)}')
@@ -1,9 +1,12 @@
 from __future__ import annotations
-from typing import Union
+from typing import List, Union
 
 import numpy as np
 
-from utils import read_file, CircularLinkedList, XYPair, Direction
+from utils import read_file, phase, find_cycle, Bitboard, Cycle, DenseGrid, Ring, XYPair, Direction, \
+    DIRECTION_CHARS, DX, DY
+
+FILENAME = 'input/day17.txt'
 
 
 class Rock:
@@ -29,123 +32,160 @@ ROCKS = [
 ]
 
 
-class TowerState:
-    def __init__(self, rock_num: int, height: int, top_row: np.array, jet_id: int, rock_id: int):
-        self.rock_num = rock_num
-        self.height = height
-        self.top_row = top_row
-        self.jet_id = jet_id
-        self.rock_id = rock_id
+def shape_rows(rock: Rock) -> List[int]:
+    # Bitboard rows count upwards from the floor, so the rock's bottom row comes first
+    return [sum([1 << y for y, value in enumerate(row) if value]) for row in rock.values[::-1].tolist()]
+
+
+SHAPES = [shape_rows(rock) for rock in ROCKS]
+
+
+class BitTower:
+    TOWER_WIDTH = 7
+    # Two towers whose top rows agree this far down behave the same from then on
+    WINDOW_ROWS = 64
+
+    def __init__(self, jets: str):
+        self.jets = [DX[DIRECTION_CHARS[jet]] for jet in jets]
+        self.board = Bitboard(0, self.TOWER_WIDTH)
+        self.jet_id = 0
+        self.rock_id = 0
+        self.cycle: Union[Cycle, None] = None
+
+    def drop_rock(self):
+        shape = SHAPES[self.rock_id]
+        self.rock_id = (self.rock_id + 1) % len(SHAPES)
+        x, y = self.board.height + 3, 2
+        while True:
+            jet = self.jets[self.jet_id]
+            self.jet_id = (self.jet_id + 1) % len(self.jets)
+            if not self.board.overlaps(shape, x, y + jet):
+                y += jet
+            if self.board.overlaps(shape, x - 1, y):
+                break
+            x -= 1
+        self.board.place(shape, x, y)
+        return self
+
+    def find_pattern(self):
+        self.cycle = find_cycle(BitTower.drop_rock, self, key=BitTower.state, value=lambda tower: tower.tower_height)
 
-    def __eq__(self, other: TowerState):
-        return True if sum(self.top_row == other.top_row) == len(self.top_row) and \
-            self.jet_id == other.jet_id and self.rock_id == other.rock_id else False
+    def get_total_height(self, num_rocks: int):
+        return self.cycle.value_at(num_rocks)
+
+    def state(self):
+        height = self.board.height
+        return self.board.window(height - self.WINDOW_ROWS, height), self.jet_id, self.rock_id
+
+    @property
+    def tower_height(self):
+        return self.board.height
 
 
 class Tower:
     TOWER_WIDTH = 7
-    MAX_HEIGHT = 10_000
+    FLOOR = 0
+    WALL = 8
+    # Rocks practically never settle further below the surface than this
+    PROFILE_DEPTH = 64
 
     def __init__(self, jets: str):
-        self.rocks = CircularLinkedList(ROCKS)
-        self.jets = CircularLinkedList([Direction.LEFT if jet == '<' else Direction.RIGHT for jet in jets])
-        self.tower = np.zeros((self.MAX_HEIGHT, self.TOWER_WIDTH + 2))
-        self.tower[:, 0] = 8 * np.ones((self.MAX_HEIGHT, ))
-        self.tower[:, self.TOWER_WIDTH + 1] = 8 * np.ones((self.MAX_HEIGHT, ))
-        self.tower[self.MAX_HEIGHT - 1, :] = 8 * np.ones((self.TOWER_WIDTH + 2, ))
-        self.current_x = self.MAX_HEIGHT - 1
-        self.unique_states = []
-        self.start_rock = 0
-        self.start_height = 0
-        self.rocks_in_pattern = 0
-        self.pattern_height = 0
-
-    def let_rocks_fall(self, num):
-        rock_num = 0
-        while rock_num < num:
-            rock = self.rocks.get_next()
-            rock.pos = self.__get_rock_starting_pos(rock)
-            rock_num += 1
-            self.__let_rock_fall(rock)
-        return self.tower_height
+        self.jet_pattern = jets
+        self.rocks = Ring(ROCKS)
+        self.jets = Ring([DIRECTION_CHARS[jet] for jet in jets])
+        self.tower = DenseGrid(fill=0, dtype=float)
+        self.tower.set_region((self.FLOOR, 0), self.WALL * np.ones((1, self.TOWER_WIDTH + 2)))
+        self.walls_top = self.FLOOR
+        self.current_x = self.FLOOR
+        self.cycle: Union[Cycle, None] = None
+
+    def drop_rock(self):
+        rock = self.rocks.get_next()
+        rock.pos = self.__get_rock_starting_pos(rock)
+        self.__let_rock_fall(rock)
+        return self
 
     def find_pattern(self):
-        rock_num = 0
-        pattern_found = False
-        while not pattern_found:
-            rock = self.rocks.get_next()
-            rock.pos = self.__get_rock_starting_pos(rock)
-            rock_num += 1
-            self.__let_rock_fall(rock)
-            current_state = TowerState(rock_num,
-                                       self.tower_height,
-                                       self.tower[self.current_x, :],
-                                       self.jets.current.id,
-                                       self.rocks.current.id)
-            self.unique_states.append(current_state)
-            if self.unique_states.count(current_state) == 3:
-                states = [state for state in self.unique_states if state == current_state]
-                if states[2].rock_num - states[1].rock_num == states[1].rock_num - states[0].rock_num:
-                    pattern_found = True
-                    self.start_rock = states[0].rock_num
-                    self.start_height = states[0].height
-                    self.rocks_in_pattern = states[1].rock_num - states[0].rock_num
-                    self.pattern_height = states[1].height - states[0].height
-                    return
+        # Heights are recorded per rock, so any rock count is read off the cycle without simulating again
+        self.cycle = find_cycle(Tower.drop_rock, self, key=Tower.state, value=lambda tower: tower.tower_height)
 
     def get_total_height(self, num_rocks: int):
-        num_of_repeats = (num_rocks - self.start_rock) // self.rocks_in_pattern
-        extra_rocks = (num_rocks - self.start_rock) % self.rocks_in_pattern
+        return self.cycle.value_at(num_rocks)
 
-        tower = Tower(data[0])
-        height_floor_to_extra = tower.let_rocks_fall(self.start_rock + extra_rocks)
-        extra_height = height_floor_to_extra - self.start_height
-        return self.start_height + self.pattern_height * num_of_repeats + extra_height
+    def state(self):
+        return self.profile, self.jets.position, self.rocks.position
+
+    @property
+    def profile(self):
+        # Depth of the highest block in every column below the top of the tower
+        bottom = min(self.current_x + self.PROFILE_DEPTH, self.FLOOR + 1)
+        filled = self.tower.get_region((self.current_x, 1), (bottom, self.TOWER_WIDTH + 1)) != 0
+        return tuple(np.where(filled.any(axis=0), filled.argmax(axis=0), self.PROFILE_DEPTH).tolist())
+
+    def __build_walls(self, top: int):
+        # The tower grows upwards without bound, so walls are only raised as high as the rocks reach
+        if top < self.walls_top:
+            wall = self.WALL * np.ones((self.walls_top - top, 1))
+            self.tower.set_region((top, 0), wall)
+            self.tower.set_region((top, self.TOWER_WIDTH + 1), wall)
+            self.walls_top = top
 
     def __let_rock_fall(self, rock: Rock):
+        self.__build_walls(rock.pos.x)
         landed = False
         while not landed:
             jet = self.jets.get_next()
             if self.__can_move(rock, jet):
-                rock.pos.y += 1 if jet == Direction.RIGHT else -1
+                rock.pos.y += DX[jet]
             if self.__can_move(rock, Direction.DOWN):
                 rock.pos.x += 1
             else:
                 landed = True
                 self.current_x = min(rock.pos.x, self.current_x)
-                target = self.tower[rock.pos.x:rock.pos.x + rock.height, rock.pos.y: rock.pos.y + rock.width]
-                self.tower[rock.pos.x:rock.pos.x + rock.height, rock.pos.y: rock.pos.y + rock.width] = \
-                    target + rock.values
+                target = self.__region(rock.pos.x, rock.pos.y, rock)
+                self.tower.set_region(rock.pos.coordinates, target + rock.values)
 
     @property
     def tower_height(self):
-        return self.MAX_HEIGHT - 1 - self.current_x
+        return self.FLOOR - self.current_x
 
     def __get_rock_starting_pos(self, rock: Rock):
         # This is pos of upper left corner of rock
         return XYPair((self.current_x - 3 - rock.height, 3))
 
+    def __region(self, x: int, y: int, rock: Rock):
+        return self.tower.get_region((x, y), (x + rock.height, y + rock.width))
+
     def __can_move(self, rock: Rock, direction: Direction):
-        if direction == Direction.RIGHT:
-            target_array = self.tower[rock.pos.x: rock.pos.x + rock.height, \
-                           rock.pos.y + 1: rock.pos.y + 1 + rock.width]
-        elif direction == Direction.LEFT:
-            target_array = self.tower[rock.pos.x: rock.pos.x + rock.height, \
-                           rock.pos.y - 1: rock.pos.y - 1 + rock.width]
-        else:
-            target_array = self.tower[rock.pos.x + 1: rock.pos.x + 1 + rock.height, \
-                           rock.pos.y: rock.pos.y + rock.width]
+        # The tower's rows grow downwards like y, so rows step by DY and columns by DX
+        target_array = self.__region(rock.pos.x + DY[direction], rock.pos.y + DX[direction], rock)
         return sum(sum(np.logical_and(rock.values, target_array))) == 0
 
 
-if __name__ == '__main__':
-    filename = 'input/day17.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    with phase('simulate'):
+        tower = BitTower(data[0])
+        tower.find_pattern()
+    return tower
+
 
-    tower = Tower(data[0])
-    tower.find_pattern()
-    tower_height = tower.get_total_height(2022)
-    print(f'The answer to Part 1 is {tower_height}')
+def part1(tower: BitTower):
+    return tower.get_total_height(2022)
 
-    tower_height = tower.get_total_height(1000000000000)
-    print(f'The answer to Part 1 is {tower_height}')
+
+def part2(tower: BitTower):
+    return tower.get_total_height(1000000000000)
+
+
+def parse_dense(data: List[str]):
+    with phase('parse'):
+        tower = Tower(data[0])
+    with phase('simulate'):
+        tower.find_pattern()
+    return tower
+
+
+if __name__ == '__main__':
+    tower = parse(read_file(FILENAME))
+    print(f'The answer to Part 1 is {part1(tower)}')
+    print(f'The answer to Part 2 is {part2(tower)}')
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 from enum import Enum
+from functools import lru_cache
 from math import ceil
 import numpy as np
 from typing import List, Dict
-from queue import Queue
-import json
 
-from utils import read_file, Part
+from search import Packer, bfs
+from utils import read_file, phase, Part, PROGRESS
+
+FILENAME = 'input/day19.txt'
+
+
+@lru_cache(maxsize=None)
+def state_key(time_limit: int) -> Packer:
+    # At most one robot is built a minute, so no count, stock or minute outgrows these over the time limit
+    if time_limit < 0:
+        raise ValueError(f'time limit must not be negative, got {time_limit}')
+    return Packer(*[time_limit + 2] * 4, *[(time_limit + 1) ** 2] * 4, time_limit + 1)
 
 
 class Resource(str, Enum):
@@ -53,8 +63,8 @@ class State:
                        self.minutes <= other.minutes else False
 
     @property
-    def identifier(self):
-        return f"{json.dumps(self.robots)}-{json.dumps(self.resources)}-{self.minutes}"
+    def key(self):
+        return state_key(self.time_limit).pack(*self.robots.values(), *self.resources.values(), self.minutes)
 
     @property
     def geodes(self):
@@ -118,19 +128,18 @@ class State:
 
 class Puzzle:
     def __init__(self, data: List[str], part: Part):
-        self.blueprints = [Blueprint(line) for line in data if line]
+        with phase('parse'):
+            self.blueprints = [Blueprint(line) for line in data if line]
         if part == Part.PT2:
             self.blueprints = [b for i, b in enumerate(self.blueprints) if i < 3]
-        self.visited = {}
-        self.queue = Queue()
         self.max_geodes = []
 
     def process(self, time_limit: int):
         for i in range(len(self.blueprints)):
             state = State(self.blueprints[i], time_limit)
-            self.visited = {}
-            self.queue = Queue()
-            self.max_geodes.append(self.bfs(state))
+            with phase('search'):
+                self.max_geodes.append(self.bfs(state))
+            PROGRESS.tick('blueprints')
 
     @property
     def answer_pt1(self):
@@ -140,31 +149,38 @@ class Puzzle:
     def answer_pt2(self):
         return np.prod([v for v in self.max_geodes])
 
-    def bfs(self, state: State):
-        self.queue.put(state)
+    @staticmethod
+    def bfs(state: State):
         max_geodes = 0
 
-        while self.queue.qsize() > 0:
-            state = self.queue.get()
-            end_state = state.get_end_state()
-            max_geodes = max(max_geodes, end_state.geodes)
-            for robot_type in state.robots_to_buy:
-                neighbor = state.get_new_state(robot_type)
-                if neighbor.can_beat_max(max_geodes):
-                    if neighbor.identifier not in self.visited:
-                        self.queue.put(neighbor)
-                        self.visited[neighbor.identifier] = neighbor.geodes
+        def neighbors(state: State):
+            nonlocal max_geodes
+            max_geodes = max(max_geodes, state.get_end_state().geodes)
+            PROGRESS.improve('geodes', max_geodes)
+            return [neighbor for robot_type in state.robots_to_buy
+                    if (neighbor := state.get_new_state(robot_type)).can_beat_max(max_geodes)]
+
+        bfs([state], neighbors, key=lambda s: s.key)
         return max_geodes
 
 
-if __name__ == '__main__':
-    filename = 'input/day19.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return data
 
+
+def part1(data: List[str]):
     puzzle = Puzzle(data, Part.PT1)
     puzzle.process(24)
-    print(f"The answer to Part 1 is {puzzle.answer_pt1}")
+    return puzzle.answer_pt1
+
 
+def part2(data: List[str]):
     puzzle = Puzzle(data, Part.PT2)
     puzzle.process(32)
-    print(f"The answer to Part 2 is {puzzle.answer_pt2}")
+    return puzzle.answer_pt2
+
+
+if __name__ == '__main__':
+    data = parse(read_file(FILENAME))
+    print(f"The answer to Part 1 is {part1(data)}")
+    print(f"The answer to Part 2 is {part2(data)}")
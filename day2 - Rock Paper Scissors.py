@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 from enum import Enum
+from typing import List, Tuple
 
 from utils import read_file
 
+FILENAME = 'input/day2.txt'
+
 
 class Outcome(int, Enum):
     LOSS = 0
@@ -78,12 +81,20 @@ class RoundPt2(Round):
         return self.OUTCOME[self.second_letter]
 
 
-if __name__ == '__main__':
-    filename = 'input/day2.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return [(line[0], line[2]) for line in data]
+
+
+def part1(letters: List[Tuple[str, str]]):
+    return sum([RoundPt1(*pair).points for pair in letters])
 
-    rounds = [RoundPt1(line[0], line[2]) for line in data]
-    print(f"The answer to part 1 is {sum([round.points for round in rounds])}")
 
-    rounds = [RoundPt2(line[0], line[2]) for line in data]
-    print(f"The answer to part 2 is {sum([round.points for round in rounds])}")
+def part2(letters: List[Tuple[str, str]]):
+    return sum([RoundPt2(*pair).points for pair in letters])
+
+
+if __name__ == '__main__':
+    letters = parse(read_file(FILENAME))
+
+    print(f"The answer to part 1 is {part1(letters)}")
+    print(f"The answer to part 2 is {part2(letters)}")
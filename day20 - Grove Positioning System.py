@@ -4,6 +4,8 @@ from typing import List
 
 from utils import read_file, CircularLinkedList, Node, Part
 
+FILENAME = 'input/day20.txt'
+
 
 class File:
     DECRYPTION_KEY = 811589153
@@ -52,16 +54,25 @@ class File:
         node.next = post_node
 
 
-if __name__ == '__main__':
-    filename = 'input/day20.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return data
 
+
+def part1(data: List[str]):
     file = File(data, Part.PT1)
     file.mix()
-    print(f'The answer to Pt 1 is {file.answer}')
+    return file.answer
+
 
+def part2(data: List[str]):
     file = File(data, Part.PT2)
     for _ in range(10):
         file.mix()
-    print(f'The answer to Pt 2 is {file.answer}')
+    return file.answer
+
+
+if __name__ == '__main__':
+    data = parse(read_file(FILENAME))
+    print(f'The answer to Pt 1 is {part1(data)}')
+    print(f'The answer to Pt 2 is {part2(data)}')
 
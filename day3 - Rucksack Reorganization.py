@@ -3,6 +3,7 @@ from typing import List
 
 from utils import read_file
 
+FILENAME = 'input/day3.txt'
 NUM_PER_GROUP = 3
 
 
@@ -44,12 +45,20 @@ class Group(Base):
         return common.pop()
 
 
-if __name__ == '__main__':
-    filename = 'input/day3.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return [Rucksack(line) for line in data]
+
+
+def part1(rucksacks: List[Rucksack]):
+    return sum([rucksack.priority for rucksack in rucksacks])
 
-    rucksacks = [Rucksack(line) for line in data]
-    print(f"The answer to part 1 is {sum([rucksack.priority for rucksack in rucksacks])}")
 
+def part2(rucksacks: List[Rucksack]):
     groups = [Group(r) for r in [rucksacks[num:num+NUM_PER_GROUP] for num in range(0, len(rucksacks), NUM_PER_GROUP)]]
-    print(f"The answer to part 2 is {sum([group.priority for group in groups])}")
+    return sum([group.priority for group in groups])
+
+
+if __name__ == '__main__':
+    rucksacks = parse(read_file(FILENAME))
+    print(f"The answer to part 1 is {part1(rucksacks)}")
+    print(f"The answer to part 2 is {part2(rucksacks)}")
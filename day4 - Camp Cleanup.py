@@ -1,5 +1,9 @@
+from typing import List
+
 from utils import read_file
 
+FILENAME = 'input/day4.txt'
+
 
 class Assignment:
     def __init__(self, assignment: str):
@@ -27,10 +31,19 @@ class Pair:
         return assignment1.sections.issubset(assignment2.sections)
 
 
-if __name__ == '__main__':
-    filename = 'input/day4.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return [Pair(line) for line in data]
+
+
+def part1(pairs: List[Pair]):
+    return sum([pair.one_contains_another for pair in pairs])
 
-    pairs = [Pair(line) for line in data]
-    print(f"The answer to part 1 is {sum([pair.one_contains_another for pair in pairs])}")
-    print(f"The answer to part 2 is {sum([pair.assignments_overlap for pair in pairs])}")
+
+def part2(pairs: List[Pair]):
+    return sum([pair.assignments_overlap for pair in pairs])
+
+
+if __name__ == '__main__':
+    pairs = parse(read_file(FILENAME))
+    print(f"The answer to part 1 is {part1(pairs)}")
+    print(f"The answer to part 2 is {part2(pairs)}")
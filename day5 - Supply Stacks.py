@@ -4,6 +4,8 @@ from typing import List
 
 from utils import read_file, Part
 
+FILENAME = 'input/day5.txt'
+
 
 class Instruction:
     def __init__(self, text: str):
@@ -45,7 +47,7 @@ class SupplyStacks:
         stacks = [LifoQueue() for i in range(self.num_stacks)]
         for height in range(self.max_height-1, -1, -1):
             [stacks[stack].put(char) for stack in range(self.num_stacks) if
-             (char := data[height][self.__get_stack_col(stack)]).isalpha()]
+             (char := self.drawing[height][self.__get_stack_col(stack)]).isalpha()]
         return stacks
 
     def process_instructions(self, part: Part):
@@ -66,13 +68,24 @@ class SupplyStacks:
         return "".join([self.stacks[stack_num].get() for stack_num in range(self.num_stacks)])
 
 
-if __name__ == '__main__':
-    filename = 'input/Day5.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return data
+
 
+def part1(data: List[str]):
     supply_stacks = SupplyStacks(data)
     supply_stacks.process_instructions(Part.PT1)
-    print(f"The answer to part 1 is {supply_stacks.answer}")
+    return supply_stacks.answer
+
+
+def part2(data: List[str]):
     supply_stacks = SupplyStacks(data)
     supply_stacks.process_instructions(Part.PT2)
-    print(f"The answer to part 1 is {supply_stacks.answer}")
+    return supply_stacks.answer
+
+
+if __name__ == '__main__':
+    data = parse(read_file(FILENAME))
+
+    print(f"The answer to part 1 is {part1(data)}")
+    print(f"The answer to part 2 is {part2(data)}")
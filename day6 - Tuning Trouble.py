@@ -1,10 +1,13 @@
 from queue import Queue
+from typing import List, Sequence
 
-from utils import read_file, Part
+from utils import map_file, Part
+
+FILENAME = 'input/day6.txt'
 
 
 class Datastream:
-    def __init__(self, text: str, part: Part):
+    def __init__(self, text: Sequence, part: Part):
         self.part = part
         self.datastream = text
         self.pos = 0
@@ -39,14 +42,26 @@ class Datastream:
         return self.pos
 
 
-if __name__ == '__main__':
-    filename = 'input/Day6.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return data[0]
 
-    datastream = Datastream(data[0], Part.PT1)
-    datastream.find_marker()
-    print(f"The {datastream.type_of_marker} marker is located at {datastream.location_of_marker}")
 
-    datastream = Datastream(data[0], Part.PT2)
+def find_marker(text: Sequence, part: Part):
+    datastream = Datastream(text, part)
     datastream.find_marker()
-    print(f"The {datastream.type_of_marker} marker is located at {datastream.location_of_marker}")
+    return datastream
+
+
+def part1(text: str):
+    return find_marker(text, Part.PT1).location_of_marker
+
+
+def part2(text: str):
+    return find_marker(text, Part.PT2).location_of_marker
+
+
+if __name__ == '__main__':
+    with map_file(FILENAME) as stream:
+        for part in Part:
+            datastream = find_marker(stream, part)
+            print(f"The {datastream.type_of_marker} marker is located at {datastream.location_of_marker}")
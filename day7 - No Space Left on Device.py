@@ -1,9 +1,11 @@
+from __future__ import annotations
+
 from queue import LifoQueue
-from typing import List
+from typing import Iterable, Iterator
 
-from anytree import AnyNode, PreOrderIter
+from utils import iter_lines
 
-from utils import read_file
+FILENAME = 'input/day7.txt'
 
 
 class File:
@@ -43,22 +45,31 @@ class Line:
         return File(name=self.words[1], size=int(self.words[0]))
 
 
-class Directory(AnyNode):
-    def __init__(self, id: str, parent=None, children=None, files=[]):
-        super().__init__(id=id, parent=parent, children=children)
+class Directory:
+    def __init__(self, id: str, parent: Directory = None, files=[]):
+        self.id = id
+        self.parent = parent
+        self.children = []
         self.files = files
+        if parent:
+            parent.children.append(self)
 
     @property
     def size(self):
         return sum([file.size for file in self.files]) + sum([dir.size for dir in self.children])
 
+    def pre_order(self) -> Iterator[Directory]:
+        yield self
+        for child in self.children:
+            yield from child.pre_order()
+
 
 class TerminalOutput:
     MAX_SIZE = 100_000
     TOTAL_SPACE = 70_000_000
     NEEDED_SPACE = 30_000_000
 
-    def __init__(self, lines: List[str]):
+    def __init__(self, lines: Iterable[str]):
         self.lines = [Line(line) for line in lines]
         self.pos = 0
         self.queue = LifoQueue()
@@ -89,13 +100,11 @@ class TerminalOutput:
 
     @property
     def answer_pt1(self):
-        return sum([dir.size for dir in
-                    PreOrderIter(self.root_dir, filter_=lambda n: n.size < self.MAX_SIZE)])
+        return sum([dir.size for dir in self.root_dir.pre_order() if dir.size < self.MAX_SIZE])
 
     @property
     def answer_pt2(self):
-        return min([dir.size for dir in
-                    PreOrderIter(self.root_dir, filter_=lambda n: n.size > self.required_to_free)])
+        return min([dir.size for dir in self.root_dir.pre_order() if dir.size > self.required_to_free])
 
     def process(self):
         while self.pos < self.num_lines:
@@ -113,11 +122,21 @@ class TerminalOutput:
             self.pos += 1
 
 
-if __name__ == '__main__':
-    filename = 'input/day7.txt'
-    data = read_file(filename)
-
+def parse(data: Iterable[str]):
     terminal_output = TerminalOutput(data)
     terminal_output.process()
-    print(f"The answer to Pt 1 is {terminal_output.answer_pt1}")
-    print(f"The answer to Pt 2 is {terminal_output.answer_pt2}")
+    return terminal_output
+
+
+def part1(terminal_output: TerminalOutput):
+    return terminal_output.answer_pt1
+
+
+def part2(terminal_output: TerminalOutput):
+    return terminal_output.answer_pt2
+
+
+if __name__ == '__main__':
+    terminal_output = parse(iter_lines(FILENAME))
+    print(f"The answer to Pt 1 is {part1(terminal_output)}")
+    print(f"The answer to Pt 2 is {part2(terminal_output)}")
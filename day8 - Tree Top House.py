@@ -2,15 +2,23 @@ from typing import List
 
 import numpy as np
 
+from cache import cached_arrays
+from parsing import digit_grid
 from utils import read_file, Direction
 
+FILENAME = 'input/day8.txt'
+
 
 class Map:
     def __init__(self, tree_data: List[str]):
-        self.trees = np.array([[int(c) for c in line] for line in tree_data])
+        self.trees = cached_arrays(__file__, tree_data, ['trees'], lambda: self.__parse(tree_data))['trees']
         self.visibility = np.ones((self.rows, self.cols), dtype=bool)
         self.scenic_scores = 2 * np.ones((self.rows, self.cols), dtype=int)
 
+    @staticmethod
+    def __parse(tree_data: List[str]):
+        return {'trees': digit_grid(tree_data).astype(int)}
+
     @property
     def rows(self):
         return self.trees.shape[0]
@@ -56,11 +64,21 @@ class Map:
         return next((pos + 1 for pos, t in enumerate(trees) if t >= height), len(trees))
 
 
-if __name__ == '__main__':
-    filename = 'input/day8.txt'
-    data = read_file(filename)
-
+def parse(data: List[str]):
     map = Map(data)
     map.process()
-    print(f"The answer to Pt 1 is {map.visible_trees}")
-    print(f"The answer to Pt 2 is {map.max_scenic_score}")
+    return map
+
+
+def part1(map: Map):
+    return map.visible_trees
+
+
+def part2(map: Map):
+    return map.max_scenic_score
+
+
+if __name__ == '__main__':
+    map = parse(read_file(FILENAME))
+    print(f"The answer to Pt 1 is {part1(map)}")
+    print(f"The answer to Pt 2 is {part2(map)}")
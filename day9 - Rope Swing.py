@@ -1,22 +1,21 @@
 from __future__ import annotations
 from typing import List
 
-import numpy as np
+from utils import read_file, DenseGrid, XYPair, Direction, DIRECTION_CHARS
 
-from utils import read_file, XYPair, Direction
+FILENAME = 'input/day9.txt'
 
 
 class Rope:
-    SIZE = 1000
-    START = (500, 500)
+    START = (0, 0)
 
     def __init__(self, knots: int = 2):
         self.knots = [XYPair(self.START) for _ in range(knots)]
-        self.grid = np.zeros((self.SIZE, self.SIZE), dtype=bool)
+        self.grid = DenseGrid(fill=False, dtype=bool)
 
     @property
     def answer(self):
-        return sum(sum(self.grid))
+        return self.grid.count(True)
 
     @property
     def head(self):
@@ -32,15 +31,11 @@ class Rope:
     def move_knots(self):
         for i in range(len(self.knots) - 1):
             current_knot, next_knot = self.knots[i], self.knots[i+1]
-            deltas = current_knot - next_knot
-            if abs(deltas.x) == 2:
-                next_knot.move(Direction.RIGHT) if deltas.x > 0 else next_knot.move(Direction.LEFT)
-                if abs(deltas.y) == 1:
-                    next_knot.move(Direction.DOWN) if deltas.y > 0 else next_knot.move(Direction.UP)
-            if abs(deltas.y) == 2:
-                next_knot.move(Direction.DOWN) if deltas.y > 0 else next_knot.move(Direction.UP)
-                if abs(deltas.x) == 1:
-                    next_knot.move(Direction.RIGHT) if deltas.x > 0 else next_knot.move(Direction.LEFT)
+            dx, dy = current_knot.x - next_knot.x, current_knot.y - next_knot.y
+            # A knot two away in either axis takes one step towards the one ahead along both
+            if abs(dx) == 2 or abs(dy) == 2:
+                next_knot.x += (dx > 0) - (dx < 0)
+                next_knot.y += (dy > 0) - (dy < 0)
 
     def simulate_motions(self, motions: List[Motion]):
         for motion in motions:
@@ -50,32 +45,39 @@ class Rope:
         for step in range(motion.steps):
             self.move_head(motion.direction)
             self.move_knots()
-            self.grid[self.tail.x, self.tail.y] = True
+            self.grid[self.tail.coordinates] = True
 
 
 class Motion:
-    DIR_DICT = {'R': Direction.RIGHT, 'L': Direction.LEFT, 'U': Direction.UP, 'D': Direction.DOWN}
-
     def __init__(self, text: str):
         self.text = text
 
     @property
     def direction(self) -> Direction:
-        return self.DIR_DICT[self.text[0]]
+        return DIRECTION_CHARS[self.text[0]]
 
     @property
     def steps(self):
         return int(self.text.split()[1])
 
 
-if __name__ == '__main__':
-    filename = 'input/day9.txt'
-    data = read_file(filename)
+def parse(data: List[str]):
+    return [Motion(line) for line in data]
 
+
+def part1(motions: List[Motion]):
     rope = Rope(2)
-    rope.simulate_motions([Motion(line) for line in data])
-    print(f"The answer to Pt 1 is {rope.answer}")
+    rope.simulate_motions(motions)
+    return rope.answer
+
 
+def part2(motions: List[Motion]):
     rope = Rope(10)
-    rope.simulate_motions([Motion(line) for line in data])
-    print(f"The answer to Pt 2 is {rope.answer}")
+    rope.simulate_motions(motions)
+    return rope.answer
+
+
+if __name__ == '__main__':
+    motions = parse(read_file(FILENAME))
+    print(f"The answer to Pt 1 is {part1(motions)}")
+    print(f"The answer to Pt 2 is {part2(motions)}")
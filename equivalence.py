@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from generators import GENERATORS, generate
+from runner import DAY_MODULE, PARSE, PART_FUNCTIONS, ROOT, format_seconds, load_day
+
+DEFAULT_SEEDS = 5
+DEFAULT_SCALE = 0.5
+REFERENCE = 'reference'
+CURRENT = 'current'
+SHOWN_MISMATCHES = 3
+# A day moved onto a faster engine keeps the earlier one beside it: engine name -> its parse, part1 and part2
+ENGINES: Dict[int, Dict[str, Tuple[str, str, str]]] = {
+    17: {'dense': ('parse_dense', 'part1', 'part2')},
+    23: {'dense': ('parse', 'dense_part1', 'dense_part2')},
+    24: {'states': ('Valley', 'part1', 'part2')},
+}
+# Runs inside a checkout of another revision, so it only relies on the parse/part1/part2 surface;
+# day modules from before that surface only run as scripts and are reported as unsupported
+CHILD = '''
+import importlib.util, json, sys, time
+spec = importlib.util.spec_from_file_location("day", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+if not hasattr(module, "parse"):
+    print(json.dumps({"unsupported": "its day modules have no parse/part1/part2 to call"}))
+    sys.exit()
+cases = []
+for data in json.load(sys.stdin):
+    answers, error, start = {}, None, time.perf_counter()
+    try:
+        parsed = module.parse(data)
+        for part, name in [("1", "part1"), ("2", "part2")]:
+            if hasattr(module, name):
+                answers[part] = getattr(module, name)(parsed)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    cases.append({"answers": answers, "seconds": time.perf_counter() - start, "error": error})
+print(json.dumps(cases, default=lambda value: value.item() if hasattr(value, "item") else str(value)))
+'''
+
+Answers = Dict[str, Any]
+
+
+class Case:
+    def __init__(self, answers: Answers, seconds: float, error: Optional[str] = None):
+        self.answers = answers
+        self.seconds = seconds
+        self.error = error
+
+
+class Comparison:
+    def __init__(self, day: int, engine: str):
+        self.day = day
+        self.engine = engine
+        self.cases = 0
+        self.reference_seconds = 0.0
+        self.engine_seconds = 0.0
+        self.reference_errors: List[Tuple[int, str]] = []
+        self.mismatches: List[Tuple[int, str, Any, Any]] = []
+
+    @property
+    def compared(self) -> int:
+        return self.cases - len(self.reference_errors)
+
+    @property
+    def speedup(self) -> Optional[float]:
+        return self.reference_seconds / self.engine_seconds if self.engine_seconds > 0 else None
+
+
+def normalize(answer: Any) -> Any:
+    return answer.item() if hasattr(answer, 'item') else answer
+
+
+def engines(day: int) -> Dict[str, Any]:
+    module = load_day(day)
+    stages = [PARSE] + list(PART_FUNCTIONS.values())
+    found = {REFERENCE: module}
+    for name, attributes in ENGINES.get(day, {}).items():
+        found[name] = SimpleNamespace(**dict(zip(stages, [getattr(module, attribute) for attribute in attributes])))
+    return found
+
+
+def run_engine(engine: Any, data: List[str]) -> Case:
+    answers, start = {}, time.perf_counter()
+    try:
+        parsed = engine.parse(data)
+        for part, name in PART_FUNCTIONS.items():
+            if hasattr(engine, name):
+                answers[part.value] = normalize(getattr(engine, name)(parsed))
+    except Exception as e:
+        return Case(answers, time.perf_counter() - start, f'{type(e).__name__}: {e}')
+    return Case(answers, time.perf_counter() - start)
+
+
+def checkout(revision: str, directory: str):
+    archive = subprocess.run(['git', 'archive', revision], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(directory, filter='data')
+
+
+def run_revision(directory: str, day: int, inputs: List[List[str]]) -> Optional[List[Case]]:
+    paths = [name for name in os.listdir(directory) if (match := DAY_MODULE.match(name)) and int(match.group(1)) == day]
+    if not paths:
+        return None
+    process = subprocess.run([sys.executable, '-c', CHILD, os.path.join(directory, paths[0])], cwd=directory,
+                             input=json.dumps(inputs), capture_output=True, text=True)
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1:] or ['crashed']
+        return [Case({}, 0.0, error[0]) for _ in inputs]
+    output = json.loads(process.stdout)
+    if isinstance(output, dict):
+        raise ValueError(f'cannot compare against this revision: {output["unsupported"]}')
+    return [Case(case['answers'], case['seconds'], case['error']) for case in output]
+
+
+def compare(day: int, seeds: List[int], scale: float, revision_dir: Optional[str] = None,
+            names: Optional[List[str]] = None) -> List[Comparison]:
+    candidates = engines(day)
+    reference_engine = candidates.pop(REFERENCE)
+    if revision_dir:
+        candidates = {CURRENT: reference_engine, **candidates}
+    candidates = {name: engine for name, engine in candidates.items() if not names or name in names}
+    if not candidates:
+        return []
+
+    inputs = [generate(day, scale, seed) for seed in seeds]
+    if revision_dir:
+        reference = run_revision(revision_dir, day, inputs)
+        if reference is None:
+            return []
+    else:
+        reference = [run_engine(reference_engine, data) for data in inputs]
+
+    comparisons = []
+    for name, engine in candidates.items():
+        comparison = Comparison(day, name)
+        for seed, data, expected in zip(seeds, inputs, reference):
+            actual = run_engine(engine, data)
+            comparison.cases += 1
+            comparison.reference_seconds += expected.seconds
+            comparison.engine_seconds += actual.seconds
+            # An input the reference cannot solve says nothing about the engine
+            if expected.error:
+                comparison.reference_errors.append((seed, expected.error))
+                continue
+            if actual.error:
+                comparison.mismatches.append((seed, 'error', None, actual.error))
+                continue
+            for part in sorted(set(expected.answers) | set(actual.answers)):
+                if expected.answers.get(part) != actual.answers.get(part):
+                    comparison.mismatches.append((seed, part, expected.answers.get(part), actual.answers.get(part)))
+        comparisons.append(comparison)
+    return comparisons
+
+
+def report(comparisons: List[Comparison]):
+    print(f"{'Day':>3}  {'engine':>12}  {'cases':>5}  {'mismatches':>10}  {'ref errors':>10}  {'reference':>9}  "
+          f"{'engine':>9}  {'speedup':>7}")
+    for c in comparisons:
+        speedup = '-' if c.speedup is None else f'{c.speedup:.2f}x'
+        print(f'{c.day:>3}  {c.engine:>12}  {c.cases:>5}  {len(c.mismatches):>10}  {len(c.reference_errors):>10}  '
+              f'{format_seconds(c.reference_seconds):>9}  {format_seconds(c.engine_seconds):>9}  {speedup:>7}')
+        for seed, part, expected, actual in c.mismatches[:SHOWN_MISMATCHES]:
+            print(f'     seed {seed} part {part}: expected {expected!r}, got {actual!r}')
+        for seed, error in c.reference_errors[:SHOWN_MISMATCHES]:
+            print(f'     seed {seed}: reference failed with {error}')
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Check that alternative engines give the reference answers')
+    parser.add_argument('days', nargs='*', type=int, help='days to check (default: all with a generator)')
+    parser.add_argument('--seeds', type=int, default=DEFAULT_SEEDS, help='number of generated inputs per day')
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--scale', type=float, default=DEFAULT_SCALE, help='input size as a multiple of the puzzle')
+    parser.add_argument('--engines', nargs='+', help='only check these engines')
+    parser.add_argument('--reference', metavar='REVISION',
+                        help='use the solvers of this git revision as the reference and compare the working tree')
+    args = parser.parse_args(argv)
+
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+    days = args.days or sorted(GENERATORS)
+    comparisons = []
+    with tempfile.TemporaryDirectory() as revision_dir:
+        if args.reference:
+            checkout(args.reference, revision_dir)
+        try:
+            for day in days:
+                comparisons += compare(day, seeds, args.scale, revision_dir if args.reference else None,
+                                       args.engines)
+        except ValueError as e:
+            raise SystemExit(f'{args.reference}: {e}')
+    report(comparisons)
+    # A reference that could not answer leaves its engines unchecked, which is no pass either
+    if not any([comparison.compared for comparison in comparisons]):
+        raise SystemExit('no engine was compared against a reference answer')
+    if any([comparison.mismatches or comparison.reference_errors for comparison in comparisons]):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,456 @@
+from __future__ import annotations
+
+import argparse
+import random
+import string
+from math import sqrt
+from typing import Callable, Dict, List, Optional, Tuple
+
+LOWER = string.ascii_lowercase
+LETTERS = string.ascii_letters
+SNAFU_DIGITS = {-2: '=', -1: '-', 0: '0', 1: '1', 2: '2'}
+
+
+def scaled(base: int, scale: float, minimum: int = 1) -> int:
+    return max(minimum, round(base * scale))
+
+
+def scaled_side(base: int, scale: float, minimum: int = 2) -> int:
+    return max(minimum, round(base * sqrt(scale)))
+
+
+def day1(scale: float, rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(scaled(250, scale)):
+        lines.extend([str(rng.randint(1000, 60_000)) for _ in range(rng.randint(1, 15))])
+        lines.append('')
+    return lines[:-1]
+
+
+def day2(scale: float, rng: random.Random) -> List[str]:
+    return [f'{rng.choice("ABC")} {rng.choice("XYZ")}' for _ in range(scaled(2500, scale))]
+
+
+def day3(scale: float, rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(scaled(100, scale)):
+        badge = rng.choice(LETTERS)
+        others = [c for c in LETTERS if c != badge]
+        rng.shuffle(others)
+        for pool in [others[0:17], others[17:34], others[34:51]]:
+            common = rng.choice(pool)
+            rest = [c for c in pool if c != common]
+            first, second = rest[:8] + [badge], rest[8:]
+            size = rng.randint(8, 20)
+            first_half = [common] + [rng.choice(first) for _ in range(size - 1)]
+            second_half = [common] + [rng.choice(second) for _ in range(size - 1)]
+            if badge not in first_half:
+                first_half[1] = badge
+            rng.shuffle(first_half)
+            rng.shuffle(second_half)
+            lines.append(''.join(first_half + second_half))
+    return lines
+
+
+def day4(scale: float, rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        a, b = sorted([rng.randint(1, 99), rng.randint(1, 99)])
+        c, d = sorted([rng.randint(1, 99), rng.randint(1, 99)])
+        lines.append(f'{a}-{b},{c}-{d}')
+    return lines
+
+
+def day5(scale: float, rng: random.Random) -> List[str]:
+    num_stacks = 9
+    stacks = [[rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, 8))] for _ in range(num_stacks)]
+    height = max([len(stack) for stack in stacks])
+    drawing = []
+    for level in range(height - 1, -1, -1):
+        drawing.append(' '.join([f'[{stack[level]}]' if level < len(stack) else '   ' for stack in stacks]))
+    drawing.append(' '.join([f' {i + 1} ' for i in range(num_stacks)]))
+
+    sizes = [len(stack) for stack in stacks]
+    moves = []
+    for _ in range(scaled(500, scale)):
+        from_stack = rng.choice([i for i in range(num_stacks) if sizes[i] > 1])
+        to_stack = rng.choice([i for i in range(num_stacks) if i != from_stack])
+        num = rng.randint(1, min(sizes[from_stack] - 1, 30))
+        sizes[from_stack] -= num
+        sizes[to_stack] += num
+        moves.append(f'move {num} from {from_stack + 1} to {to_stack + 1}')
+    return drawing + [''] + moves
+
+
+def day6(scale: float, rng: random.Random) -> List[str]:
+    length = scaled(4096, scale, minimum=32)
+    prefix = ''.join([rng.choice('abc') for _ in range(length - 20)])
+    return [prefix + ''.join(rng.sample(LOWER, 14)) + ''.join([rng.choice(LOWER) for _ in range(6)])]
+
+
+def day7(scale: float, rng: random.Random) -> List[str]:
+    num_dirs = scaled(180, scale)
+    children: Dict[int, List[int]] = {0: []}
+    for i in range(1, num_dirs):
+        children[i] = []
+        children[rng.randrange(i)].append(i)
+    file_size = max(1, 50_000_000 // (num_dirs * 3))
+
+    lines = ['$ cd /']
+
+    def visit(node: int):
+        lines.append('$ ls')
+        for child in children[node]:
+            lines.append(f'dir d{child}')
+        for i in range(rng.randint(0, 6)):
+            lines.append(f'{rng.randint(1, 2 * file_size)} f{i}.{rng.choice(["txt", "dat", "log"])}')
+        for child in children[node]:
+            lines.append(f'$ cd d{child}')
+            visit(child)
+            lines.append('$ cd ..')
+
+    visit(0)
+    return lines
+
+
+def day8(scale: float, rng: random.Random) -> List[str]:
+    side = scaled_side(99, scale, minimum=3)
+    return [''.join([str(rng.randint(0, 9)) for _ in range(side)]) for _ in range(side)]
+
+
+def day9(scale: float, rng: random.Random) -> List[str]:
+    x, y, lines = 0, 0, []
+    for _ in range(scaled(2000, scale)):
+        steps = rng.randint(1, 20)
+        # lean back towards the start so the rope stays on a puzzle-sized canvas
+        direction = rng.choice('RLUD') if rng.random() < 0.5 else \
+            ('L' if x > 0 else 'R') if rng.random() < 0.5 else ('U' if y > 0 else 'D')
+        x += steps if direction == 'R' else -steps if direction == 'L' else 0
+        y += steps if direction == 'D' else -steps if direction == 'U' else 0
+        lines.append(f'{direction} {steps}')
+    return lines
+
+
+def day10(scale: float, rng: random.Random) -> List[str]:
+    lines, cycles = [], 0
+    while cycles < scaled(240, scale, minimum=240):
+        lines.append('noop' if rng.random() < 0.4 else f'addx {rng.choice([-1, 1]) * rng.randint(1, 20)}')
+        cycles += 1 if lines[-1] == 'noop' else 2
+    return lines
+
+
+def day11(scale: float, rng: random.Random) -> List[str]:
+    num_monkeys = 8
+    primes = rng.sample([2, 3, 5, 7, 11, 13, 17, 19, 23], num_monkeys)
+    square = rng.randrange(num_monkeys)
+    lines = []
+    for i in range(num_monkeys):
+        items = [str(rng.randint(50, 99)) for _ in range(scaled(rng.randint(1, 8), scale))]
+        operation = 'old * old' if i == square else f'old {rng.choice("+*")} {rng.randint(1, 19)}'
+        targets = rng.sample([m for m in range(num_monkeys) if m != i], 2)
+        lines.extend([
+            f'Monkey {i}:',
+            f'  Starting items: {", ".join(items)}',
+            f'  Operation: new = {operation}',
+            f'  Test: divisible by {primes[i]}',
+            f'    If true: throw to monkey {targets[0]}',
+            f'    If false: throw to monkey {targets[1]}',
+            '',
+        ])
+    return lines[:-1]
+
+
+def day12(scale: float, rng: random.Random) -> List[str]:
+    rows, cols = scaled_side(41, scale, minimum=3), scaled_side(160, scale, minimum=3)
+    peak = (rng.randrange(rows), rng.randrange(cols))
+    start = max([(i, j) for i in [0, rows - 1] for j in [0, cols - 1]],
+                key=lambda p: abs(p[0] - peak[0]) + abs(p[1] - peak[1]))
+    max_dist = abs(start[0] - peak[0]) + abs(start[1] - peak[1])
+    step = max(1, max_dist // 25)
+    grid = []
+    for i in range(rows):
+        row = []
+        for j in range(cols):
+            dist = abs(i - peak[0]) + abs(j - peak[1])
+            height = min(25, (max_dist - dist) // step)
+            row.append(LOWER[0] if dist > 1 and rng.random() < 0.05 else LOWER[height])
+        grid.append(row)
+    grid[start[0]][start[1]] = 'S'
+    grid[peak[0]][peak[1]] = 'E'
+    return [''.join(row) for row in grid]
+
+
+def packet(rng: random.Random, depth: int = 0) -> list:
+    return [rng.randint(0, 10) if depth >= 4 or rng.random() < 0.6 else packet(rng, depth + 1)
+            for _ in range(rng.randint(0, 5))]
+
+
+def day13(scale: float, rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(scaled(150, scale)):
+        lines.extend([str(packet(rng)).replace(' ', ''), str(packet(rng)).replace(' ', ''), ''])
+    return lines[:-1]
+
+
+def day14(scale: float, rng: random.Random) -> List[str]:
+    depth = min(450, scaled_side(170, scale, minimum=10))
+    lines = []
+    for _ in range(scaled(150, scale)):
+        x, y = rng.randint(500 - depth // 2, 500 + depth // 2), rng.randint(2, depth)
+        points = [(x, y)]
+        for i in range(rng.randint(1, 5)):
+            length = rng.randint(1, 10)
+            if i % 2 == 0:
+                x = min(max(x + rng.choice([-length, length]), 500 - depth), 500 + depth)
+            else:
+                y = min(max(y + rng.choice([-length, length]), 2), depth)
+            points.append((x, y))
+        lines.append(' -> '.join([f'{px},{py}' for px, py in points]))
+    return lines
+
+
+def _uncovered_candidates(sensors: List[Tuple[int, int, int]], bound: int):
+    ups = [x - y + s for sx, sy, r in sensors for x, y in [(sx, sy)] for s in [r + 1, -r - 1]]
+    downs = [x + y + s for sx, sy, r in sensors for x, y in [(sx, sy)] for s in [r + 1, -r - 1]]
+    candidates = {(0, 0), (0, bound), (bound, 0), (bound, bound)}
+    for a in ups:
+        candidates.update([(a, 0), (a + bound, bound), (0, -a), (bound, bound - a)])
+        for b in downs:
+            x = (a + b) // 2
+            candidates.update([(x, b - x), (x + 1, b - x - 1)])
+    for b in downs:
+        candidates.update([(b, 0), (b - bound, bound), (0, b), (bound, b - bound)])
+    for x, y in candidates:
+        if 0 <= x <= bound and 0 <= y <= bound and \
+                all([abs(x - sx) + abs(y - sy) > r for sx, sy, r in sensors]):
+            yield x, y
+
+
+def day15(scale: float, rng: random.Random) -> List[str]:
+    bound = 4_000_000
+    hidden = (rng.randint(0, bound), rng.randint(0, bound))
+    sensors: List[Tuple[int, int, int]] = []
+
+    def add_sensor(x: int, y: int):
+        sensors.append((x, y, abs(x - hidden[0]) + abs(y - hidden[1]) - 1))
+
+    def away_from_hidden(coordinate: int, hidden_coordinate: int, shift: int):
+        return coordinate + shift * (1 if coordinate > hidden_coordinate else -1 if coordinate < hidden_coordinate
+                                     else rng.choice([-1, 1]))
+
+    while len(sensors) < scaled(25, scale, minimum=4):
+        x, y = rng.randint(0, bound), rng.randint(0, bound)
+        if abs(x - hidden[0]) + abs(y - hidden[1]) > 1:
+            add_sensor(x, y)
+    # a sensor placed further out along the line from the distress beacon through a gap always covers it
+    while gap := next((c for c in _uncovered_candidates(sensors, bound) if c != hidden), None):
+        shift = rng.randint(1000, 100_000)
+        add_sensor(away_from_hidden(gap[0], hidden[0], shift), away_from_hidden(gap[1], hidden[1], shift))
+    rng.shuffle(sensors)
+
+    lines = []
+    for x, y, r in sensors:
+        dx = rng.randint(0, r)
+        bx, by = x + rng.choice([-1, 1]) * dx, y + rng.choice([-1, 1]) * (r - dx)
+        lines.append(f'Sensor at x={x}, y={y}: closest beacon is at x={bx}, y={by}')
+    return lines
+
+
+def day16(scale: float, rng: random.Random) -> List[str]:
+    num_valves = min(676, scaled(55, scale, minimum=3))
+    num_flowing = min(num_valves - 1, 15, scaled(15, scale, minimum=2))
+    names = ['AA'] + rng.sample([a + b for a in string.ascii_uppercase for b in string.ascii_uppercase
+                                 if a + b != 'AA'], num_valves - 1)
+    tunnels: Dict[str, set] = {name: set() for name in names}
+    for i in range(1, num_valves):
+        other = names[rng.randrange(i)]
+        tunnels[names[i]].add(other)
+        tunnels[other].add(names[i])
+    for _ in range(num_valves // 4):
+        a, b = rng.sample(names, 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    flowing = set(rng.sample(names[1:], num_flowing))
+
+    lines = []
+    for name in names:
+        rate = rng.randint(2, 25) if name in flowing else 0
+        adjacent = sorted(tunnels[name])
+        lead = 'tunnels lead to valves' if len(adjacent) > 1 else 'tunnel leads to valve'
+        lines.append(f'Valve {name} has flow rate={rate}; {lead} {", ".join(adjacent)}')
+    return lines
+
+
+def day17(scale: float, rng: random.Random) -> List[str]:
+    return [''.join([rng.choice('<>') for _ in range(scaled(10_091, scale, minimum=8))])]
+
+
+def day18(scale: float, rng: random.Random) -> List[str]:
+    side = max(3, round(20 * scale ** (1 / 3)))
+    centre, radius = side / 2, side / 2
+    cubes = [(x, y, z) for x in range(side) for y in range(side) for z in range(side)
+             if (x - centre) ** 2 + (y - centre) ** 2 + (z - centre) ** 2 <= radius ** 2 and rng.random() < 0.6]
+    rng.shuffle(cubes)
+    return [f'{x},{y},{z}' for x, y, z in cubes]
+
+
+def day19(scale: float, rng: random.Random) -> List[str]:
+    lines = []
+    for i in range(scaled(30, scale, minimum=3)):
+        lines.append(f'Blueprint {i + 1}: Each ore robot costs {rng.randint(2, 4)} ore. '
+                     f'Each clay robot costs {rng.randint(2, 4)} ore. '
+                     f'Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. '
+                     f'Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} obsidian.')
+    return lines
+
+
+def day20(scale: float, rng: random.Random) -> List[str]:
+    numbers = [rng.choice([-1, 1]) * rng.randint(1, 10_000) for _ in range(scaled(5000, scale, minimum=3) - 1)]
+    numbers.insert(rng.randrange(len(numbers) + 1), 0)
+    return [str(n) for n in numbers]
+
+
+def day21(scale: float, rng: random.Random) -> List[str]:
+    used = {'root', 'humn'}
+    jobs: Dict[str, str] = {}
+
+    def new_name():
+        while (name := ''.join(rng.choices(LOWER, k=4))) in used:
+            pass
+        used.add(name)
+        return name
+
+    def leaf(value: int, name: Optional[str] = None):
+        name = name or new_name()
+        jobs[name] = str(value)
+        return name, value
+
+    def tree(size: int) -> Tuple[str, int]:
+        if size <= 1:
+            return leaf(rng.randint(1, 20))
+        left, left_value = tree(rng.randint(1, size - 1))
+        if left_value != 0 and rng.random() < 0.2:
+            divisors = [d for d in range(1, 21) if left_value % d == 0]
+            right, right_value = leaf(rng.choice(divisors))
+            op, value = '/', left_value // right_value
+        else:
+            right, right_value = tree(size - 1 - (size - 1) // 2)
+            op = '*' if abs(left_value * right_value) < 1_000_000 and rng.random() < 0.3 else rng.choice('+-')
+            value = left_value * right_value if op == '*' else \
+                left_value + right_value if op == '+' else left_value - right_value
+        name = new_name()
+        jobs[name] = f'{left} {op} {right}'
+        return name, value
+
+    def constant(value: int) -> str:
+        name, subtree_value = tree(rng.randint(1, 20))
+        adjust, adjust_value = leaf(abs(value - subtree_value))
+        total = new_name()
+        jobs[total] = f'{name} {"+" if value >= subtree_value else "-"} {adjust}'
+        return total
+
+    size = scaled(2000, scale, minimum=8)
+    humn_value, answer = rng.randint(1, 1000), rng.randint(1, 10_000)
+    path, path_value = leaf(humn_value, 'humn')
+    path_answer = answer
+    depth = min(70, max(1, round(sqrt(size))))
+    for _ in range(depth):
+        other, other_value = tree(rng.randint(1, max(1, size // depth)))
+        op = '*' if abs(path_answer) < 1_000_000 and 0 < abs(other_value) < 10 and rng.random() < 0.2 else \
+            rng.choice('+-')
+        name = new_name()
+        if rng.random() < 0.5:
+            jobs[name] = f'{path} {op} {other}'
+            path_answer = path_answer * other_value if op == '*' else \
+                path_answer + other_value if op == '+' else path_answer - other_value
+        else:
+            jobs[name] = f'{other} {op} {path}'
+            path_answer = path_answer * other_value if op == '*' else \
+                other_value + path_answer if op == '+' else other_value - path_answer
+        path = name
+    other = constant(path_answer)
+    jobs['root'] = f'{path} + {other}' if rng.random() < 0.5 else f'{other} + {path}'
+
+    lines = [f'{name}: {job}' for name, job in jobs.items()]
+    rng.shuffle(lines)
+    return lines
+
+
+def day22(scale: float, rng: random.Random) -> List[str]:
+    size = 50
+    faces = {0: (1, 3), 1: (1, 2), 2: (0, 2), 3: (0, 1)}
+    rows = []
+    for r in range(4 * size):
+        first, last = faces[r // size]
+        line = [' '] * (size * first) + [
+            '#' if rng.random() < 0.05 and (r, c) != (0, size) else '.' for c in range(size * first, size * last)
+        ]
+        rows.append(''.join(line))
+    instructions = ''.join([f'{rng.randint(1, 40)}{rng.choice("LR")}' for _ in range(scaled(2000, scale))])
+    return rows + ['', instructions + str(rng.randint(1, 40))]
+
+
+def day23(scale: float, rng: random.Random) -> List[str]:
+    side = scaled_side(72, scale, minimum=3)
+    return [''.join(['#' if rng.random() < 0.5 else '.' for _ in range(side)]) for _ in range(side)]
+
+
+def day24(scale: float, rng: random.Random) -> List[str]:
+    height = scaled_side(25, scale, minimum=2)
+    width = 5 * height - height // 5
+    lines = ['#.' + '#' * width]
+    for _ in range(height):
+        row = [rng.choice('<>^v') if rng.random() < 0.7 else '.' for _ in range(width)]
+        for j in [0, width - 1]:
+            if row[j] in '^v':
+                row[j] = rng.choice('<>.')
+        lines.append('#' + ''.join(row) + '#')
+    lines.append('#' * width + '.#')
+    return lines
+
+
+def to_snafu(num: int) -> str:
+    digits = ''
+    while num:
+        num, remainder = divmod(num, 5)
+        if remainder > 2:
+            remainder -= 5
+            num += 1
+        digits = SNAFU_DIGITS[remainder] + digits
+    return digits or '0'
+
+
+def day25(scale: float, rng: random.Random) -> List[str]:
+    count = scaled(120, scale)
+    return [to_snafu(rng.randint(1, 40_000_000_000_000 // count)) for _ in range(count)]
+
+
+GENERATORS: Dict[int, Callable[[float, random.Random], List[str]]] = {
+    1: day1, 2: day2, 3: day3, 4: day4, 5: day5, 6: day6, 7: day7, 8: day8, 9: day9, 10: day10,
+    11: day11, 12: day12, 13: day13, 14: day14, 15: day15, 16: day16, 17: day17, 18: day18, 19: day19, 20: day20,
+    21: day21, 22: day22, 23: day23, 24: day24, 25: day25,
+}
+
+
+def generate(day: int, scale: float = 1.0, seed: int = 0) -> List[str]:
+    return GENERATORS[day](scale, random.Random(f'{day}-{scale}-{seed}'))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Generate puzzle inputs of a chosen size')
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('--scale', type=float, default=1.0, help='multiple of the puzzle-sized input')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', '-o', help='file to write (default: stdout)')
+    args = parser.parse_args(argv)
+
+    text = '\n'.join(generate(args.day, args.scale, args.seed)) + '\n'
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text, end='')
+
+
+if __name__ == '__main__':
+    main()
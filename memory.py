@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import resource
+import sys
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from utils import PHASES
+
+KB = 1024
+MB = 1024 * KB
+TOP_SITES = 5
+CLEAR_REFS = '/proc/self/clear_refs'
+STATUS = '/proc/self/status'
+IGNORED = [tracemalloc.Filter(False, __file__),
+           tracemalloc.Filter(False, tracemalloc.__file__),
+           tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+           tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+           tracemalloc.Filter(False, '<unknown>')]
+
+Site = Tuple[str, int]
+
+
+def reset_peak_rss() -> bool:
+    # Linux lets a process reset its own high-water mark; elsewhere the peak covers the whole process
+    try:
+        with open(CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss() -> int:
+    try:
+        with open(STATUS, 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * KB
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * KB
+
+
+def top_sites(snapshot: Optional[tracemalloc.Snapshot], top: int = TOP_SITES) -> List[Site]:
+    if snapshot is None:
+        return []
+    stats = snapshot.filter_traces(IGNORED).statistics('lineno')[:top]
+    return [(f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}', stat.size) for stat in stats]
+
+
+def format_bytes(size: Optional[int]) -> str:
+    if size is None:
+        return '-'
+    return f'{size / MB:.1f}MB' if size >= MB else f'{size / KB:.0f}KB'
+
+
+class MemoryTracker:
+    def __init__(self, trace: bool = False, top: int = TOP_SITES):
+        self.trace = trace
+        self.top = top
+        self.rss: Dict[str, int] = {}
+        self.traced: Dict[str, int] = {}
+        self.sites: Dict[str, List[Site]] = {}
+        self.stage: Optional[str] = None
+        self.largest = 0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def start(self, stage: str):
+        self.stage, self.largest, self.snapshot = stage, 0, None
+        reset_peak_rss()
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            PHASES.checkpoint = self.checkpoint
+
+    def checkpoint(self):
+        # tracemalloc cannot say what was live at the peak, so keep the fullest snapshot seen at a phase boundary
+        current = tracemalloc.get_traced_memory()[0]
+        if current > self.largest:
+            self.largest, self.snapshot = current, tracemalloc.take_snapshot()
+
+    def stop(self):
+        self.rss[self.stage] = peak_rss()
+        if self.trace:
+            PHASES.checkpoint = None
+            self.checkpoint()
+            self.traced[self.stage] = tracemalloc.get_traced_memory()[1]
+            self.sites[self.stage] = top_sites(self.snapshot, self.top)
+            self.snapshot = None
+
+    def close(self):
+        if self.trace and tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import List, Tuple, Union
+
+from utils import np
+
+INTEGER = re.compile(r'-?\d+')
+WORD = re.compile(r'[A-Za-z]+')
+
+Nested = Union[int, List['Nested']]
+
+
+def ints(text: str) -> List[int]:
+    return [int(value) for value in INTEGER.findall(text)]
+
+
+def words(text: str) -> List[str]:
+    return WORD.findall(text)
+
+
+def pairs(text: str) -> List[Tuple[int, int]]:
+    values = ints(text)
+    return list(zip(values[0::2], values[1::2]))
+
+
+def nested_list(text: str) -> List[Nested]:
+    # Packets of lists and ints are valid JSON, so the C decoder does the work without eval's risks
+    value = json.loads(text)
+    if not isinstance(value, list):
+        raise ValueError(f'expected a list, got {text!r}')
+    return value
+
+
+def char_grid(lines: List[str], fill: str = ' ') -> np.ndarray:
+    # One character per cell; short lines are padded with fill so ragged maps still make a rectangle
+    width = max([len(line) for line in lines], default=0)
+    text = ''.join([line.ljust(width, fill) for line in lines])
+    if not text:
+        return np.zeros((len(lines), width), dtype='<U1')
+    # Viewing one long string as single characters avoids building a Python list of them
+    return np.array(text).reshape(1).view('<U1').reshape(len(lines), width)
+
+
+def digit_grid(lines: List[str]) -> np.ndarray:
+    # '<U1' cells are UCS-4 code points, so an int32 view is ord() of every cell at once
+    return char_grid(lines, '0').view(np.int32) - ord('0')
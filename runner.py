@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import re
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+import baseline
+from cache import CACHE_DIR, PARSE_CACHE_DIR, ParseCache, ResultCache, enable_parse_cache, input_digest, source_digest
+from memory import MemoryTracker, Site, format_bytes
+from utils import read_file, Budget, Part, PHASES, PROGRESS
+
+ROOT = Path(__file__).resolve().parent
+DAY_MODULE = re.compile(r'^[dD]ay(\d+) - .+\.py$')
+GENERATED = '<generated>'
+READ = 'read'
+PARSE = 'parse'
+PART_FUNCTIONS = {Part.PT1: 'part1', Part.PT2: 'part2'}
+STAGES = [READ, PARSE] + list(PART_FUNCTIONS.values())
+
+_modules: Dict[int, ModuleType] = {}
+
+
+def find_day_modules() -> Dict[int, Path]:
+    paths = {int(match.group(1)): path for path in ROOT.glob('*.py') if (match := DAY_MODULE.match(path.name))}
+    return dict(sorted(paths.items()))
+
+
+def load_day(day: int) -> ModuleType:
+    if day not in _modules:
+        path = find_day_modules()[day]
+        spec = importlib.util.spec_from_file_location(f'day{day}', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[day] = module
+    return _modules[day]
+
+
+def unload_day(day: int):
+    # The next load_day executes the file again, picking up edits made since it was loaded
+    _modules.pop(day, None)
+
+
+def input_path(module: ModuleType, input_dir: Optional[str] = None) -> str:
+    return module.FILENAME if input_dir is None else os.path.join(input_dir, os.path.basename(module.FILENAME))
+
+
+class DayResult:
+    def __init__(self, day: int, filename: str):
+        self.day = day
+        self.filename = filename
+        self.answers: Dict[Part, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self.phases: Dict[str, Tuple[int, float, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.rss: Dict[str, int] = {}
+        self.traced: Dict[str, int] = {}
+        self.sites: Dict[str, List[Site]] = {}
+        self.cached: List[str] = []
+        self.error: Optional[str] = None
+
+    @property
+    def total(self):
+        return sum(self.timings.values())
+
+    @property
+    def peak_rss(self):
+        return max(self.rss.values()) if self.rss else None
+
+    @property
+    def peak_traced(self):
+        return max(self.traced.values()) if self.traced else None
+
+    def timed(self, stage: str, func, *args, tracker: Optional[MemoryTracker] = None):
+        if tracker:
+            tracker.start(stage)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[stage] = time.perf_counter() - start
+            if tracker:
+                tracker.stop()
+                self.rss[stage] = tracker.rss[stage]
+                if stage in tracker.traced:
+                    self.traced[stage], self.sites[stage] = tracker.traced[stage], tracker.sites[stage]
+
+
+def solve(day: int, data: List[str], result: Optional[DayResult] = None, memory: bool = False,
+          cache: Optional[ResultCache] = None, budget: Optional[Budget] = None,
+          parts: Optional[List[Part]] = None) -> DayResult:
+    module = load_day(day)
+    result = result or DayResult(day, GENERATED)
+    names = {part: name for part, name in PART_FUNCTIONS.items()
+             if hasattr(module, name) and (not parts or part in parts)}
+    keys: Dict[Part, str] = {}
+    if cache:
+        input_hash, source_hash = input_digest(data), source_digest(module.__file__)
+        for part, name in list(names.items()):
+            keys[part] = cache.key(input_hash, source_hash, name)
+            hit, answer = cache.get(day, keys[part])
+            if hit:
+                result.answers[part] = answer
+                result.cached.append(name)
+                del names[part]
+    if not names:
+        return result
+
+    tracker = MemoryTracker(trace=memory)
+    try:
+        PROGRESS.start(budget, f'day{day} {PARSE}')
+        parsed = result.timed(PARSE, module.parse, data, tracker=tracker)
+        for part, name in names.items():
+            PROGRESS.start(budget, f'day{day} {name}')
+            result.answers[part] = result.timed(name, getattr(module, name), parsed, tracker=tracker)
+            if cache:
+                cache.put(day, keys[part], result.answers[part])
+    except Exception as e:
+        result.error = f'{type(e).__name__}: {e}'
+    finally:
+        tracker.close()
+    return result
+
+
+@contextmanager
+def instrumented(result: DayResult, profile_dir: Optional[str] = None):
+    PHASES.reset()
+    PHASES.enable(profile_dir, label=f'day{result.day}')
+    try:
+        yield result
+    finally:
+        PHASES.disable()
+        result.phases, result.counters = PHASES.summary, dict(PHASES.counters)
+
+
+def run_day(day: int, input_dir: Optional[str] = None, phases: bool = False,
+            profile_dir: Optional[str] = None, memory: bool = False,
+            cache: Optional[ResultCache] = None, budget: Optional[Budget] = None) -> DayResult:
+    return run_input(day, input_path(load_day(day), input_dir), phases, profile_dir, memory, cache, budget)
+
+
+def run_input(day: int, filename: str, phases: bool = False, profile_dir: Optional[str] = None,
+              memory: bool = False, cache: Optional[ResultCache] = None,
+              budget: Optional[Budget] = None) -> DayResult:
+    result = DayResult(day, filename)
+    try:
+        data = result.timed(READ, read_file, result.filename)
+    except OSError as e:
+        result.error = f'{type(e).__name__}: {e}'
+        return result
+    if not (phases or profile_dir or memory):
+        return solve(day, data, result, cache=cache, budget=budget)
+    # Phase boundaries are where the memory tracker looks for the largest live allocations
+    with instrumented(result, profile_dir):
+        return solve(day, data, result, memory, budget=budget)
+
+
+def run_days(days: List[int], input_dir: Optional[str] = None, workers: Optional[int] = None,
+             phases: bool = False, profile_dir: Optional[str] = None, memory: bool = False,
+             cache: Optional[ResultCache] = None, budget: Optional[Budget] = None) -> List[DayResult]:
+    if workers == 1:
+        return [run_day(day, input_dir, phases, profile_dir, memory, cache, budget) for day in days]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_day, day, input_dir, phases, profile_dir, memory, cache, budget) for day in days]
+        results = [future.result() for future in as_completed(futures)]
+    return sorted(results, key=lambda r: r.day)
+
+
+def add_budget_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--time-budget', type=float, help='seconds each stage may run before it is stopped')
+    parser.add_argument('--node-budget', type=int, help='loop iterations or search states each stage may use')
+    parser.add_argument('--progress', type=float, metavar='SECONDS',
+                        help='report the progress of long searches on stderr at this interval')
+
+
+def add_parse_cache_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--parse-cache', action='store_true',
+                        help='keep parsed grids as .npy files and memory-map them on later runs')
+    parser.add_argument('--parse-cache-dir', default=PARSE_CACHE_DIR, help='directory holding parsed grids')
+
+
+def parse_cache_from(args: argparse.Namespace) -> Optional[ParseCache]:
+    if not args.parse_cache:
+        return None
+    enable_parse_cache(args.parse_cache_dir)
+    return ParseCache(args.parse_cache_dir)
+
+
+def budget_from(args: argparse.Namespace) -> Optional[Budget]:
+    if args.time_budget is None and args.node_budget is None and args.progress is None:
+        return None
+    return Budget(args.time_budget, args.node_budget, args.progress)
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    return '-' if seconds is None else f'{seconds:.4f}s'
+
+
+def report(results: List[DayResult], wall_time: float):
+    print(f"{'Day':>3}  " + "  ".join([f'{stage:>9}' for stage in STAGES + ['total']]) + f"  {'peak RSS':>9}")
+    for result in results:
+        timings = ['cached' if stage in result.cached else format_seconds(result.timings.get(stage))
+                   for stage in STAGES]
+        print(f'{result.day:>3}  ' + '  '.join([f'{t:>9}' for t in timings + [format_seconds(result.total)]]) +
+              f'  {format_bytes(result.peak_rss):>9}' + (f'  {result.error}' if result.error else ''))
+
+    if any([result.traced for result in results]):
+        print(f"\n{'Day':>3}  {'stage':>9}  {'time':>9}  {'peak RSS':>9}  {'traced':>9}  top allocation sites")
+        for result in results:
+            for stage, traced in result.traced.items():
+                sites = ', '.join([f'{os.path.basename(site)} ({format_bytes(size)})'
+                                   for site, size in result.sites[stage][:3]])
+                print(f'{result.day:>3}  {stage:>9}  {format_seconds(result.timings[stage]):>9}  '
+                      f'{format_bytes(result.rss[stage]):>9}  {format_bytes(traced):>9}  {sites}')
+
+    if any([result.phases for result in results]):
+        print(f"\n{'Day':>3}  {'phase':>12}  {'calls':>7}  {'wall':>9}  {'cpu':>9}")
+        for result in results:
+            for name, (calls, wall, cpu) in result.phases.items():
+                print(f'{result.day:>3}  {name:>12}  {calls:>7}  {format_seconds(wall):>9}  {format_seconds(cpu):>9}')
+            if result.counters:
+                print('     ' + ', '.join([f'{name}={value}' for name, value in result.counters.items()]))
+
+    print()
+    for result in results:
+        for part, answer in result.answers.items():
+            answer = f'\n{answer}' if isinstance(answer, str) and '\n' in answer else answer
+            print(f'Day {result.day} part {part.value}: {answer}')
+
+    serial_time = sum([result.total for result in results])
+    slowest = sorted(results, key=lambda r: r.total, reverse=True)
+    print(f'\nSuite wall time {format_seconds(wall_time)}, serial time {format_seconds(serial_time)}')
+    if slowest:
+        print(f'Critical path is day {slowest[0].day} at {format_seconds(slowest[0].total)}')
+        print('Slowest days: ' + ', '.join([f'{r.day} ({100 * r.total / serial_time:.1f}%)' for r in slowest[:5]
+                                           if serial_time > 0]))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Run the Advent of Code solvers')
+    parser.add_argument('days', nargs='*', type=int, help='days to run (default: all)')
+    parser.add_argument('--input-dir', help='directory holding the dayN.txt inputs (default: each FILENAME)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='size of the process pool')
+    parser.add_argument('--phases', action='store_true', help='report the parse/precompute/search phases solvers mark')
+    parser.add_argument('--profile-dir', help='write a cProfile dump per marked phase into this directory')
+    parser.add_argument('--memory', action='store_true',
+                        help='trace allocations per stage and report the top sites (slows the timings down)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='directory holding cached answers')
+    parser.add_argument('--no-cache', action='store_true', help='neither read nor write cached answers')
+    add_budget_arguments(parser)
+    add_parse_cache_arguments(parser)
+    baseline.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    # Measuring runs have to execute every part, so they skip the cache
+    measuring = args.phases or args.profile_dir or args.memory or args.save_baseline or args.compare
+    cache = None if args.no_cache or measuring else ResultCache(args.cache_dir)
+    parse_cache = parse_cache_from(args)
+    days = args.days or list(find_day_modules())
+    start = time.perf_counter()
+    results = run_days(days, args.input_dir, args.workers, args.phases, args.profile_dir, args.memory, cache,
+                       budget_from(args))
+    report(results, time.perf_counter() - start)
+    for store in [cache, parse_cache]:
+        if store:
+            store.evict()
+
+    entries: baseline.Baseline = {}
+    for result in results:
+        if not result.error:
+            baseline.add_entry(entries, result.day, None, baseline.metrics(result.timings, result.rss, result.traced))
+    baseline.handle_arguments(args, entries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from itertools import count
+from typing import Callable, Dict, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+from utils import PHASES, PROGRESS, identity
+
+S = TypeVar('S')
+Key = Hashable
+
+
+class Packer:
+    # Each field holds 0 <= value < its size; pack is on search hot paths and trusts the caller's sizes,
+    # since a value outside them would silently share its key with another state
+    def __init__(self, *sizes: int):
+        if not sizes or any([size < 1 for size in sizes]):
+            raise ValueError(f'packed fields need positive sizes, got {sizes}')
+        self.sizes = sizes
+        self.size = 1
+        for size in sizes:
+            self.size *= size
+
+    def pack(self, *values: int) -> int:
+        key = 0
+        for value, size in zip(values, self.sizes):
+            key = key * size + value
+        return key
+
+    def unpack(self, key: int) -> Tuple[int, ...]:
+        values = []
+        for size in reversed(self.sizes):
+            key, value = divmod(key, size)
+            values.append(value)
+        return tuple(reversed(values))
+
+
+class BitSet:
+    def __init__(self, size: int):
+        self.bits = bytearray((size + 7) >> 3)
+
+    def add(self, key: int):
+        self.bits[key >> 3] |= 1 << (key & 7)
+
+    def __contains__(self, key: int):
+        return bool(self.bits[key >> 3] & (1 << (key & 7)))
+
+
+class SearchStats:
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.frontier_peak = 0
+
+    def record(self, name: str = 'search'):
+        if PHASES.enabled:
+            PHASES.count(f'{name}.expanded', self.expanded)
+            PHASES.count(f'{name}.generated', self.generated)
+            PHASES.peak(f'{name}.frontier_peak', self.frontier_peak)
+
+    def __repr__(self):
+        return f'expanded={self.expanded} generated={self.generated} frontier_peak={self.frontier_peak}'
+
+
+class SearchResult(Generic[S]):
+    def __init__(self, goal: Optional[S], cost: Optional[int], stats: SearchStats,
+                 costs: Optional[Dict[Key, int]] = None):
+        self.goal = goal
+        self.cost = cost
+        self.stats = stats
+        self.costs = costs or {}
+
+    @property
+    def found(self):
+        return self.goal is not None
+
+
+def bfs(starts: Iterable[S], neighbors: Callable[[S], Iterable[S]], is_goal: Optional[Callable[[S], bool]] = None,
+        key: Callable[[S], Key] = identity, visited=None, costs: Optional[Dict[Key, int]] = None,
+        name: str = 'search') -> SearchResult[S]:
+    # Goals are tested as states are generated; with unit steps the first hit is already the cheapest.
+    # Passing costs records the depth of every state reached, which a goalless search needs
+    stats = SearchStats()
+    visited = set() if visited is None else visited
+    frontier = deque()
+    for start in starts:
+        visited.add(key(start))
+        if costs is not None:
+            costs[key(start)] = 0
+        if is_goal and is_goal(start):
+            stats.record(name)
+            return SearchResult(start, 0, stats, costs)
+        frontier.append((start, 0))
+    stats.frontier_peak = len(frontier)
+
+    expanded = f'{name}.expanded'
+    while frontier:
+        state, cost = frontier.popleft()
+        stats.expanded += 1
+        PROGRESS.tick(expanded)
+        for neighbor in neighbors(state):
+            neighbor_key = key(neighbor)
+            if neighbor_key in visited:
+                continue
+            visited.add(neighbor_key)
+            stats.generated += 1
+            if costs is not None:
+                costs[neighbor_key] = cost + 1
+            if is_goal and is_goal(neighbor):
+                stats.record(name)
+                return SearchResult(neighbor, cost + 1, stats, costs)
+            frontier.append((neighbor, cost + 1))
+        stats.frontier_peak = max(stats.frontier_peak, len(frontier))
+    stats.record(name)
+    return SearchResult(None, None, stats, costs)
+
+
+def dijkstra(starts: Iterable[S], neighbors: Callable[[S], Iterable[Tuple[S, int]]],
+             is_goal: Optional[Callable[[S], bool]] = None, key: Callable[[S], Key] = identity,
+             heuristic: Optional[Callable[[S], int]] = None, name: str = 'search') -> SearchResult[S]:
+    # With a heuristic this is A*; it has to be consistent for the goal cost to be optimal
+    stats = SearchStats()
+    costs: Dict[Key, int] = {}
+    closed = set()
+    ties = count()
+    frontier = []
+    for start in starts:
+        costs[key(start)] = 0
+        heapq.heappush(frontier, (heuristic(start) if heuristic else 0, next(ties), 0, start))
+    stats.frontier_peak = len(frontier)
+
+    expanded = f'{name}.expanded'
+    while frontier:
+        _, _, cost, state = heapq.heappop(frontier)
+        state_key = key(state)
+        if state_key in closed:
+            continue
+        closed.add(state_key)
+        stats.expanded += 1
+        PROGRESS.tick(expanded)
+        if is_goal and is_goal(state):
+            stats.record(name)
+            return SearchResult(state, cost, stats, costs)
+        for neighbor, weight in neighbors(state):
+            neighbor_key = key(neighbor)
+            new_cost = cost + weight
+            if neighbor_key in closed or new_cost >= costs.get(neighbor_key, new_cost + 1):
+                continue
+            costs[neighbor_key] = new_cost
+            stats.generated += 1
+            priority = new_cost + (heuristic(neighbor) if heuristic else 0)
+            heapq.heappush(frontier, (priority, next(ties), new_cost, neighbor))
+        stats.frontier_peak = max(stats.frontier_peak, len(frontier))
+    stats.record(name)
+    return SearchResult(None, None, stats, costs)
+
+
+def astar(starts: Iterable[S], neighbors: Callable[[S], Iterable[Tuple[S, int]]], is_goal: Callable[[S], bool],
+          heuristic: Callable[[S], int], key: Callable[[S], Key] = identity, name: str = 'search') -> SearchResult[S]:
+    return dijkstra(starts, neighbors, is_goal, key, heuristic, name)
@@ -1,18 +1,253 @@
 from __future__ import annotations
 
-from enum import Enum, auto
-from typing import List, Tuple, TypeVar, Union
-from functools import total_ordering
-import numpy as np
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from enum import Enum, IntEnum, auto
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+from itertools import product
+import cProfile
+import importlib
+import mmap
+import os
+import sys
+import time
+
+
+class LazyModule:
+    def __init__(self, module_name: str):
+        self.module_name = module_name
+
+    def __getattr__(self, attr: str):
+        # Cache each attribute on first use so later lookups never come back here
+        value = getattr(importlib.import_module(self.module_name), attr)
+        setattr(self, attr, value)
+        return value
+
+
+if TYPE_CHECKING:
+    import numpy as np
+    import search
+else:
+    np = LazyModule('numpy')
+    # search builds on this module, so Graph only imports it once it first runs a search
+    search = LazyModule('search')
 
 
 T = TypeVar('T')
+Cell = Tuple[int, int]
 LARGE = 1_000_000
 
 
+def identity(value):
+    return value
+
+
+def split_lines(text: str) -> List[str]:
+    # The lines read_file gives for a file holding this text: universal newlines, trailing blank lines dropped
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text.rstrip('\n').split('\n')
+
+
 def read_file(file):
     with open(file, 'r') as f:
-        return f.read().rstrip('\n').split('\n')
+        return split_lines(f.read())
+
+
+def iter_lines(file) -> Iterator[str]:
+    # Same lines as read_file, one at a time; trailing blank lines are dropped the same way
+    blanks = 0
+    with open(file, 'r') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                blanks += 1
+                continue
+            yield from [''] * blanks
+            blanks = 0
+            yield line
+
+
+def iter_groups(lines: Iterable[str]) -> Iterator[List[str]]:
+    group = []
+    for line in lines:
+        if line:
+            group.append(line)
+        elif group:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+@contextmanager
+def map_file(file) -> Iterator[Union[mmap.mmap, bytes]]:
+    with open(file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+class Phases:
+    def __init__(self):
+        self.enabled = False
+        self.profile_dir: Optional[str] = None
+        self.label = ''
+        self.profiling = False
+        self.checkpoint: Optional[Callable[[], None]] = None
+        self.calls: Dict[str, int] = {}
+        self.wall: Dict[str, float] = {}
+        self.cpu: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def enable(self, profile_dir: Optional[str] = None, label: str = ''):
+        self.enabled, self.profile_dir, self.label = True, profile_dir, label
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def disable(self):
+        self.enabled, self.profile_dir = False, None
+
+    def reset(self):
+        self.calls, self.wall, self.cpu, self.counters = {}, {}, {}, {}
+
+    def record(self, name: str, wall: float, cpu: float):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.wall[name] = self.wall.get(name, 0.0) + wall
+        self.cpu[name] = self.cpu.get(name, 0.0) + cpu
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def peak(self, name: str, value: int):
+        self.counters[name] = max(self.counters.get(name, value), value)
+
+    def profile_path(self, name: str):
+        prefix = f'{self.label}-' if self.label else ''
+        return os.path.join(self.profile_dir, f'{prefix}{name}-{self.calls.get(name, 0)}.prof')
+
+    @property
+    def summary(self) -> Dict[str, Tuple[int, float, float]]:
+        return {name: (self.calls[name], self.wall[name], self.cpu[name]) for name in self.calls}
+
+
+PHASES = Phases()
+
+
+class Phase:
+    def __init__(self, name: str):
+        self.name = name
+        self.profile: Optional[cProfile.Profile] = None
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def __enter__(self):
+        # Only the outermost phase is profiled; cProfile cannot nest
+        if PHASES.profile_dir and not PHASES.profiling:
+            PHASES.profiling = True
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall, cpu = time.perf_counter() - self.wall, time.process_time() - self.cpu
+        if self.profile:
+            self.profile.disable()
+            self.profile.dump_stats(PHASES.profile_path(self.name))
+            PHASES.profiling = False
+        PHASES.record(self.name, wall, cpu)
+        if PHASES.checkpoint:
+            PHASES.checkpoint()
+        return False
+
+
+class NoPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NO_PHASE = NoPhase()
+
+
+def phase(name: str) -> Union[Phase, NoPhase]:
+    return Phase(name) if PHASES.enabled else NO_PHASE
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class Budget:
+    def __init__(self, seconds: Optional[float] = None, nodes: Optional[int] = None,
+                 interval: Optional[float] = None):
+        self.seconds = seconds
+        self.nodes = nodes
+        self.interval = interval
+
+
+class Progress:
+    # The clock is only read every CHECK_EVERY ticks so that ticking stays cheap in hot loops
+    CHECK_EVERY = 4096
+
+    def __init__(self):
+        self.budget = Budget()
+        self.label = ''
+        self.reset()
+
+    def start(self, budget: Optional[Budget] = None, label: str = ''):
+        self.budget, self.label = budget or Budget(), label
+        self.reset()
+
+    def reset(self):
+        self.counts: Dict[str, int] = {}
+        self.best: Dict[str, int] = {}
+        self.ticks = 0
+        self.started = self.reported = time.perf_counter()
+        self.next_check = self.__next_check()
+
+    def __next_check(self) -> int:
+        if self.budget.nodes is None:
+            return self.ticks + self.CHECK_EVERY
+        return min(self.ticks + self.CHECK_EVERY, self.budget.nodes + 1)
+
+    def tick(self, name: str, amount: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+        self.ticks += amount
+        if self.ticks >= self.next_check:
+            self.check()
+
+    def improve(self, name: str, value: int):
+        self.best[name] = max(self.best.get(name, value), value)
+
+    def check(self):
+        self.next_check = self.__next_check()
+        now = time.perf_counter()
+        if self.budget.nodes is not None and self.ticks > self.budget.nodes:
+            raise BudgetExceeded(f'node budget of {self.budget.nodes} spent: {self.summary}')
+        if self.budget.seconds is not None and now - self.started > self.budget.seconds:
+            raise BudgetExceeded(f'time budget of {self.budget.seconds}s spent: {self.summary}')
+        if self.budget.interval is not None and now - self.reported >= self.budget.interval:
+            self.reported = now
+            print(f'{self.label}: {self.summary}', file=sys.stderr, flush=True)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def summary(self) -> str:
+        return ', '.join([f'{self.elapsed:.1f}s'] + [f'{name}={count}' for name, count in self.counts.items()] +
+                         [f'best {name}={value}' for name, value in self.best.items()])
+
+
+PROGRESS = Progress()
 
 
 class Part(str, Enum):
@@ -26,11 +261,24 @@ class Orientation(str, Enum):
     Z = 'Z'
 
 
-class Direction(str, Enum):
-    RIGHT = auto()
-    LEFT = auto()
-    UP = auto()
-    DOWN = auto()
+class Direction(IntEnum):
+    # Small ints in clockwise order, so the tables below are indexed by direction and turning is one lookup
+    RIGHT = 0
+    DOWN = 1
+    LEFT = 2
+    UP = 3
+
+
+# x grows to the right and y grows downwards; row/column grids step (DY[d], DX[d])
+DX = (1, 0, -1, 0)
+DY = (0, 1, 0, -1)
+TURN_RIGHT = (Direction.DOWN, Direction.LEFT, Direction.UP, Direction.RIGHT)
+TURN_LEFT = (Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.LEFT)
+OPPOSITE = (Direction.LEFT, Direction.UP, Direction.RIGHT, Direction.DOWN)
+TURNS = {'R': TURN_RIGHT, 'L': TURN_LEFT}
+DIRECTION_CHARS = {'R': Direction.RIGHT, 'D': Direction.DOWN, 'L': Direction.LEFT, 'U': Direction.UP,
+                   '>': Direction.RIGHT, 'v': Direction.DOWN, '<': Direction.LEFT, '^': Direction.UP}
+STEPS = {direction: (DX[direction], DY[direction]) for direction in Direction}
 
 
 class MapDirection(str, Enum):
@@ -90,32 +338,278 @@ class CircularLinkedList:
         return node
 
 
-@total_ordering
-class EnhancedRange:
-    def __init__(self, r: range):
-        self.r = r
+class Ring:
+    # A fixed cycle of values read through a cursor; everything is index arithmetic instead of pointer walks
+    __slots__ = ('values', 'size', 'position')
+
+    def __init__(self, elements: Iterable[T]):
+        self.values = tuple(elements)
+        self.size = len(self.values)
+        self.position = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, offset: int) -> T:
+        # Counted from the cursor, so ring[0] is the value get_next would return
+        return self.values[(self.position + offset) % self.size]
 
-    def contains(self, other):
-        return True if self.r[0] <= other.r[0] and self.r[-1] >= other.r[-1] else False
+    @property
+    def current(self) -> T:
+        return self.values[self.position]
+
+    def get_next(self) -> T:
+        position = self.position
+        self.position = position + 1 if position + 1 < self.size else 0
+        return self.values[position]
+
+    def advance(self, steps: int = 1):
+        self.position = (self.position + steps) % self.size
+
+    def take(self, count: int) -> List[T]:
+        # The next count values, wrapping as often as needed, without moving the cursor
+        return [self.values[(self.position + i) % self.size] for i in range(count)]
+
+
+class IntervalSet:
+    # Sorted, disjoint half-open [start, end) intervals; touching intervals are merged
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        for start, end in sorted(intervals):
+            if start >= end:
+                continue
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
 
-    def overlaps(self, other):
-        rs = [self.r, other.r]
-        rs.sort(key=lambda r: r[0])
-        return True if rs[0][-1] >= rs[1][0] else False
+    @classmethod
+    def _from_sorted(cls, starts: List[int], ends: List[int]) -> IntervalSet:
+        intervals = cls()
+        intervals.starts, intervals.ends = starts, ends
+        return intervals
 
-    def combine(self, other):
-        if not self.overlaps(other):
-            raise ValueError('ranges do not overlap')
-        return EnhancedRange(range(min([self.r[0], other.r[0]]), max([self.r[-1]+1, other.r[-1]+1])))
+    def copy(self) -> IntervalSet:
+        return self._from_sorted(self.starts[:], self.ends[:])
 
-    def __lt__(self, other):
-        return True if self.r[0] < other.r[0] or self.r[0] == other.r[0] and self.r[-1] < other.r[-1] else False
+    def add(self, start: int, end: int):
+        if start >= end:
+            return
+        # Every interval from low up to high touches [start, end) and collapses into one
+        low = bisect_left(self.ends, start)
+        high = bisect_right(self.starts, end)
+        if low < high:
+            start = min(start, self.starts[low])
+            end = max(end, self.ends[high - 1])
+        self.starts[low:high] = [start]
+        self.ends[low:high] = [end]
+
+    def remove(self, start: int, end: int):
+        if start >= end:
+            return
+        low = bisect_right(self.ends, start)
+        high = bisect_left(self.starts, end)
+        if low >= high:
+            return
+        starts, ends = [], []
+        if self.starts[low] < start:
+            starts.append(self.starts[low])
+            ends.append(start)
+        if self.ends[high - 1] > end:
+            starts.append(end)
+            ends.append(self.ends[high - 1])
+        self.starts[low:high] = starts
+        self.ends[low:high] = ends
+
+    def discard(self, point: int):
+        self.remove(point, point + 1)
+
+    def __contains__(self, point: int):
+        i = bisect_right(self.starts, point) - 1
+        return i >= 0 and point < self.ends[i]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def __len__(self):
+        return len(self.starts)
 
     def __eq__(self, other):
-        return self.r[0] == other.r[0] and self.r[-1] == other.r[-1]
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self):
+        return f'IntervalSet({list(self)})'
+
+    @property
+    def length(self) -> int:
+        return sum(self.ends) - sum(self.starts)
+
+    @property
+    def bounds(self) -> Optional[Tuple[int, int]]:
+        return (self.starts[0], self.ends[-1]) if self.starts else None
+
+    def gaps(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        # Uncovered stretches of [start, end), which defaults to the span of the set
+        if not self.starts and (start is None or end is None):
+            return
+        start = self.starts[0] if start is None else start
+        end = self.ends[-1] if end is None else end
+        current = start
+        for i in range(bisect_right(self.ends, start), bisect_left(self.starts, end)):
+            if self.starts[i] > current:
+                yield current, self.starts[i]
+            current = max(current, self.ends[i])
+        if current < end:
+            yield current, end
+
+    def clip(self, start: int, end: int) -> IntervalSet:
+        low = bisect_right(self.ends, start)
+        high = bisect_left(self.starts, end)
+        starts, ends = self.starts[low:high], self.ends[low:high]
+        if starts:
+            starts[0] = max(starts[0], start)
+            ends[-1] = min(ends[-1], end)
+        return self._from_sorted(starts, ends)
+
+    def intersection(self, other: IntervalSet) -> IntervalSet:
+        # Two-pointer sweep over both sorted lists
+        starts, ends = [], []
+        i = j = 0
+        while i < len(self.starts) and j < len(other.starts):
+            start = max(self.starts[i], other.starts[j])
+            end = min(self.ends[i], other.ends[j])
+            if start < end:
+                starts.append(start)
+                ends.append(end)
+            if self.ends[i] < other.ends[j]:
+                i += 1
+            else:
+                j += 1
+        return self._from_sorted(starts, ends)
+
+    def __and__(self, other: IntervalSet) -> IntervalSet:
+        return self.intersection(other)
+
+    def union(self, other: IntervalSet) -> IntervalSet:
+        return IntervalSet([*self, *other])
+
+    def __or__(self, other: IntervalSet) -> IntervalSet:
+        return self.union(other)
+
+
+class Cycle:
+    # States repeat from step start onwards every length steps; values[i] is the measured value after i steps
+    def __init__(self, start: int, length: int, values: Optional[List] = None):
+        self.start = start
+        self.length = length
+        self.values = values or []
+
+    @property
+    def delta(self):
+        return self.values[self.start + self.length] - self.values[self.start]
+
+    def equivalent_step(self, step: int) -> int:
+        return step if step < self.start else self.start + (step - self.start) % self.length
+
+    def value_at(self, step: int):
+        if step < len(self.values):
+            return self.values[step]
+        cycles, offset = divmod(step - self.start, self.length)
+        return self.values[self.start + offset] + cycles * self.delta
+
+    def __repr__(self):
+        return f'Cycle(start={self.start}, length={self.length})'
+
+
+DICT = 'dict'
+BRENT = 'brent'
+FLOYD = 'floyd'
+
+
+def first_repeat(advance: Callable[[T], T], start: T, key: Callable[[T], Hashable] = identity,
+                 value: Optional[Callable[[T], object]] = None, limit: Optional[int] = None) -> Optional[Cycle]:
+    # Remembers every key, but advance may mutate the state in place
+    seen: Dict[Hashable, int] = {}
+    values = []
+    state, step = start, 0
+    while limit is None or step <= limit:
+        if value:
+            values.append(value(state))
+        state_key = key(state)
+        if state_key in seen:
+            return Cycle(seen[state_key], step - seen[state_key], values)
+        seen[state_key] = step
+        state, step = advance(state), step + 1
+    return None
+
+
+def brent(advance: Callable[[T], T], start: T, key: Callable[[T], Hashable] = identity,
+          limit: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    # Constant memory; advance has to return new states rather than change the one it is given
+    power = length = 1
+    tortoise, hare = key(start), advance(start)
+    steps = 1
+    while tortoise != key(hare):
+        if limit is not None and steps > limit:
+            return None
+        if power == length:
+            tortoise, power, length = key(hare), power * 2, 0
+        hare, length, steps = advance(hare), length + 1, steps + 1
+    return _cycle_start(advance, start, key, length), length
+
+
+def floyd(advance: Callable[[T], T], start: T, key: Callable[[T], Hashable] = identity,
+          limit: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    tortoise, hare = advance(start), advance(advance(start))
+    steps = 1
+    while key(tortoise) != key(hare):
+        if limit is not None and steps > limit:
+            return None
+        tortoise, hare, steps = advance(tortoise), advance(advance(hare)), steps + 1
+    start_step = _cycle_start(advance, start, key, steps)
+    length, hare = 1, advance(tortoise)
+    while key(tortoise) != key(hare):
+        hare, length = advance(hare), length + 1
+    return start_step, length
+
+
+def _cycle_start(advance: Callable[[T], T], start: T, key: Callable[[T], Hashable], distance: int) -> int:
+    # A state distance steps ahead meets the one from the start where the cycle begins
+    tortoise, hare = start, start
+    for _ in range(distance):
+        hare = advance(hare)
+    step = 0
+    while key(tortoise) != key(hare):
+        tortoise, hare, step = advance(tortoise), advance(hare), step + 1
+    return step
+
+
+def find_cycle(advance: Callable[[T], T], start: T, key: Callable[[T], Hashable] = identity,
+               value: Optional[Callable[[T], object]] = None, method: str = DICT,
+               limit: Optional[int] = None) -> Optional[Cycle]:
+    if method == DICT:
+        return first_repeat(advance, start, key, value, limit)
+    found = (brent if method == BRENT else floyd)(advance, start, key, limit)
+    if found is None:
+        return None
+    start_step, length = found
+    values = []
+    if value:
+        # Replaying the prefix and one full cycle gives everything value_at needs
+        state = start
+        for _ in range(start_step + length + 1):
+            values.append(value(state))
+            state = advance(state)
+    return Cycle(start_step, length, values)
 
 
 class XYPair:
+    __slots__ = ('x', 'y')
+
     def __init__(self, xypair: Tuple[int, int]):
         self.x = xypair[0]
         self.y = xypair[1]
@@ -129,9 +623,7 @@ class XYPair:
         self.y = xypair.y
 
     def swap(self):
-        temp = self.x
-        self.x = self.y
-        self.y = temp
+        self.x, self.y = self.y, self.x
         return self
 
     def manhattan(self, other):
@@ -142,14 +634,14 @@ class XYPair:
         return f'{self.x}-{self.y}'
 
     def move(self, direction: Direction):
-        self.x += 1 if direction == Direction.RIGHT else -1 if direction == Direction.LEFT else 0
-        self.y += 1 if direction == Direction.DOWN else -1 if direction == Direction.UP else 0
+        self.x += DX[direction]
+        self.y += DY[direction]
 
     def get_neighbor(self, direction: Direction) -> XYPair:
-        return XYPair((self.x - 1, self.y)) if direction == Direction.LEFT else \
-            XYPair((self.x + 1, self.y)) if direction == Direction.RIGHT else \
-            XYPair((self.x, self.y - 1)) if direction == Direction.UP else \
-            XYPair((self.x, self.y + 1))
+        return XYPair((self.x + DX[direction], self.y + DY[direction]))
+
+    def get_neighbors(self) -> List[XYPair]:
+        return [XYPair((self.x + dx, self.y + dy)) for dx, dy in zip(DX, DY)]
 
     def get_inclusive_points_to(self, other: XYPair):
         if not( self.x == other.x or self.y == other.y):
@@ -168,13 +660,20 @@ class XYPair:
         return XYPair((self.x - other.x, self.y - other.y))
 
     def __eq__(self, other):
-        return True if self.x == other.x and self.y == other.y else False
+        if not isinstance(other, XYPair):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
 
     def __hash__(self):
-        return hash(self.x) + hash(self.y)
+        return hash((self.x, self.y))
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.x}, {self.y})'
 
 
 class XYZ:
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, xyz: Tuple[int, int, int]):
         self.x = xyz[0]
         self.y = xyz[1]
@@ -197,15 +696,505 @@ class XYZ:
         return XYZ((self.x - other.x, self.y - other.y, self.z - other.z))
 
     def __eq__(self, other):
-        return True if self.x == other.x and self.y == other.y and self.z == other.z else False
+        if not isinstance(other, XYZ):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y and self.z == other.z
 
     def __hash__(self):
-        return hash(self.x) + hash(self.y) + hash(self.z)
+        return hash((self.x, self.y, self.z))
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.x}, {self.y}, {self.z})'
 
     def manhattan(self, other):
         return abs(self.x - other.x) + abs(self.y - other.y) + abs(self.z - other.z)
 
 
+def orthogonal_offsets(dims: int) -> np.ndarray:
+    unit = np.eye(dims, dtype=np.int64)
+    return np.vstack([unit, -unit])
+
+
+def adjacent_offsets(dims: int) -> np.ndarray:
+    return np.array([offset for offset in product([-1, 0, 1], repeat=dims) if any(offset)], dtype=np.int64)
+
+
+class PointArray:
+    def __init__(self, values, dims: Optional[int] = None):
+        self.values = np.asarray(values, dtype=np.int64)
+        if dims is not None:
+            self.values = self.values.reshape(-1, dims)
+        if self.values.ndim != 2:
+            raise ValueError(f'Expected an (N, dims) array, got shape {self.values.shape}')
+
+    @classmethod
+    def from_points(cls, points: Iterable[Union[XYPair, XYZ]], dims: int = 2) -> PointArray:
+        return cls([point.coordinates for point in points], dims)
+
+    @classmethod
+    def parse(cls, lines: Iterable[str], separator: str = ',') -> PointArray:
+        return cls([line.split(separator) for line in lines])
+
+    @classmethod
+    def from_keys(cls, keys: np.ndarray, dims: int) -> PointArray:
+        bits, keys = cls.key_bits(dims), np.asarray(keys, dtype=np.int64)
+        mask, bias = (1 << bits) - 1, 1 << (bits - 1)
+        return cls(np.stack([((keys >> (bits * (dims - 1 - i))) & mask) - bias for i in range(dims)], axis=1))
+
+    @staticmethod
+    def key_bits(dims: int) -> int:
+        return 63 // dims
+
+    @property
+    def dims(self):
+        return self.values.shape[1]
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        return iter([tuple(point) for point in self.values.tolist()])
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return tuple(self.values[index].tolist())
+        return PointArray(self.values[index], self.dims)
+
+    def __contains__(self, point):
+        return bool(np.any(np.all(self.values == self.__as_values(point), axis=1)))
+
+    @staticmethod
+    def __as_values(other) -> np.ndarray:
+        if isinstance(other, PointArray):
+            return other.values
+        if isinstance(other, (XYPair, XYZ)):
+            return np.array(other.coordinates, dtype=np.int64)
+        return np.asarray(other, dtype=np.int64)
+
+    def append(self, other: PointArray) -> PointArray:
+        return PointArray(np.concatenate([self.values, other.values]), self.dims)
+
+    def shift(self, offset) -> PointArray:
+        return PointArray(self.values + self.__as_values(offset), self.dims)
+
+    def manhattan(self, other) -> np.ndarray:
+        return np.abs(self.values - self.__as_values(other)).sum(axis=1)
+
+    @property
+    def bounding_box(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        return tuple(self.values.min(axis=0).tolist()), tuple(self.values.max(axis=0).tolist())
+
+    def within(self, low, high) -> np.ndarray:
+        return np.all((self.values >= self.__as_values(low)) & (self.values <= self.__as_values(high)), axis=1)
+
+    def expand(self, offsets: Optional[np.ndarray] = None) -> PointArray:
+        offsets = orthogonal_offsets(self.dims) if offsets is None else offsets
+        return PointArray(self.values[:, None, :] + offsets[None, :, :], self.dims)
+
+    def keys(self) -> np.ndarray:
+        bits = self.key_bits(self.dims)
+        keys = np.zeros(len(self), dtype=np.int64)
+        for i in range(self.dims):
+            keys = (keys << bits) | (self.values[:, i] + (1 << (bits - 1)))
+        return keys
+
+    def unique(self) -> PointArray:
+        return PointArray(np.unique(self.values, axis=0), self.dims)
+
+    def isin(self, other: PointArray) -> np.ndarray:
+        return np.isin(self.keys(), other.keys())
+
+
+class Grid(ABC):
+    def __init__(self, fill=0, dtype=float):
+        self.fill = fill
+        self.dtype = np.dtype(dtype)
+
+    def matches(self, values, value) -> np.ndarray:
+        return np.isnan(values) if value != value else values == value
+
+    def is_fill(self, values) -> np.ndarray:
+        return self.matches(values, self.fill)
+
+    def _check_searchable(self, value):
+        if self.is_fill(np.array(value, dtype=self.dtype)):
+            raise ValueError('Cannot search an unbounded grid for its fill value')
+
+    @abstractmethod
+    def __getitem__(self, key: Cell):
+        pass
+
+    @abstractmethod
+    def __setitem__(self, key: Cell, value):
+        pass
+
+    @abstractmethod
+    def get_region(self, low: Cell, high: Cell) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def set_region(self, low: Cell, values: np.ndarray):
+        pass
+
+    @abstractmethod
+    def find(self, value) -> List[Cell]:
+        pass
+
+    @abstractmethod
+    def copy(self) -> Grid:
+        pass
+
+    def count(self, value) -> int:
+        return len(self.find(value))
+
+    @property
+    def bounds(self) -> Optional[Tuple[Cell, Cell]]:
+        cells = self.occupied()
+        if not cells:
+            return None
+        xs, ys = [cell[0] for cell in cells], [cell[1] for cell in cells]
+        return (min(xs), min(ys)), (max(xs), max(ys))
+
+    @abstractmethod
+    def occupied(self) -> List[Cell]:
+        pass
+
+    def __eq__(self, other):
+        if not isinstance(other, Grid):
+            return NotImplemented
+        bounds = self.bounds
+        if bounds != other.bounds:
+            return False
+        if bounds is None:
+            return True
+        low, high = bounds[0], (bounds[1][0] + 1, bounds[1][1] + 1)
+        return np.array_equal(self.get_region(low, high), other.get_region(low, high),
+                              equal_nan=self.dtype.kind == 'f')
+
+
+class DenseGrid(Grid):
+    def __init__(self, fill=0, dtype=float, shape: Cell = (64, 64), origin: Cell = (0, 0)):
+        super().__init__(fill, dtype)
+        self.values = np.full(shape, fill, dtype=self.dtype)
+        self.origin = origin
+
+    def __getitem__(self, key: Cell):
+        i, j = key[0] - self.origin[0], key[1] - self.origin[1]
+        if 0 <= i < self.values.shape[0] and 0 <= j < self.values.shape[1]:
+            return self.values[i, j]
+        return self.fill
+
+    def get(self, x: int, y: int):
+        # Scalar fast path for cells the grid already covers, such as a canvas sized up front: no bounds check
+        # and no growth, so a cell outside the grid is an IndexError or wraps around instead of reading fill
+        return self.values[x - self.origin[0], y - self.origin[1]]
+
+    def __setitem__(self, key: Cell, value):
+        i, j = key[0] - self.origin[0], key[1] - self.origin[1]
+        if not (0 <= i < self.values.shape[0] and 0 <= j < self.values.shape[1]):
+            self.reserve(key, (key[0] + 1, key[1] + 1))
+            i, j = key[0] - self.origin[0], key[1] - self.origin[1]
+        self.values[i, j] = value
+
+    def reserve(self, low: Cell, high: Cell):
+        old_low = self.origin
+        old_high = (self.origin[0] + self.values.shape[0], self.origin[1] + self.values.shape[1])
+        if all([old_low[k] <= low[k] and high[k] <= old_high[k] for k in range(2)]):
+            return
+        new_low = (min(old_low[0], low[0]), min(old_low[1], low[1]))
+        new_high = (max(old_high[0], high[0]), max(old_high[1], high[1]))
+        # Overflowing axes at least double around what is needed, so growth either way stays amortised
+        needed = (new_high[0] - new_low[0], new_high[1] - new_low[1])
+        shape = tuple([max(2 * self.values.shape[k], needed[k]) if needed[k] > self.values.shape[k]
+                       else needed[k] for k in range(2)])
+        origin = tuple([new_low[k] - (shape[k] - needed[k]) // 2 for k in range(2)])
+        values = np.full(shape, self.fill, dtype=self.dtype)
+        i, j = old_low[0] - origin[0], old_low[1] - origin[1]
+        values[i:i + self.values.shape[0], j:j + self.values.shape[1]] = self.values
+        self.values, self.origin = values, origin
+
+    def get_region(self, low: Cell, high: Cell) -> np.ndarray:
+        i0, j0 = low[0] - self.origin[0], low[1] - self.origin[1]
+        i1, j1 = high[0] - self.origin[0], high[1] - self.origin[1]
+        rows, cols = self.values.shape
+        if 0 <= i0 and 0 <= j0 and i1 <= rows and j1 <= cols:
+            return self.values[i0:i1, j0:j1]
+        region = np.full((i1 - i0, j1 - j0), self.fill, dtype=self.dtype)
+        ci0, cj0, ci1, cj1 = max(i0, 0), max(j0, 0), min(i1, rows), min(j1, cols)
+        if ci0 < ci1 and cj0 < cj1:
+            region[ci0 - i0:ci1 - i0, cj0 - j0:cj1 - j0] = self.values[ci0:ci1, cj0:cj1]
+        return region
+
+    def set_region(self, low: Cell, values: np.ndarray):
+        self.reserve(low, (low[0] + values.shape[0], low[1] + values.shape[1]))
+        i, j = low[0] - self.origin[0], low[1] - self.origin[1]
+        self.values[i:i + values.shape[0], j:j + values.shape[1]] = values
+
+    def __cells(self, mask: np.ndarray) -> List[Cell]:
+        xs, ys = np.nonzero(mask)
+        return list(zip((xs + self.origin[0]).tolist(), (ys + self.origin[1]).tolist()))
+
+    def find(self, value) -> List[Cell]:
+        self._check_searchable(value)
+        return self.__cells(self.matches(self.values, value))
+
+    def count(self, value) -> int:
+        self._check_searchable(value)
+        return int(np.count_nonzero(self.matches(self.values, value)))
+
+    def occupied(self) -> List[Cell]:
+        return self.__cells(~self.is_fill(self.values))
+
+    @property
+    def bounds(self) -> Optional[Tuple[Cell, Cell]]:
+        xs, ys = np.nonzero(~self.is_fill(self.values))
+        if len(xs) == 0:
+            return None
+        return ((int(xs.min()) + self.origin[0], int(ys.min()) + self.origin[1]),
+                (int(xs.max()) + self.origin[0], int(ys.max()) + self.origin[1]))
+
+    def copy(self) -> DenseGrid:
+        grid = DenseGrid(self.fill, self.dtype, (0, 0), self.origin)
+        grid.values = self.values.copy()
+        return grid
+
+
+class ChunkedGrid(Grid):
+    def __init__(self, fill=0, dtype=float, chunk: int = 64):
+        super().__init__(fill, dtype)
+        self.chunk = chunk
+        self.chunks: Dict[Cell, np.ndarray] = {}
+
+    def __getitem__(self, key: Cell):
+        ci, i = divmod(key[0], self.chunk)
+        cj, j = divmod(key[1], self.chunk)
+        block = self.chunks.get((ci, cj))
+        return self.fill if block is None else block[i, j]
+
+    def __setitem__(self, key: Cell, value):
+        ci, i = divmod(key[0], self.chunk)
+        cj, j = divmod(key[1], self.chunk)
+        self.__block(ci, cj)[i, j] = value
+
+    def __block(self, ci: int, cj: int) -> np.ndarray:
+        if (ci, cj) not in self.chunks:
+            self.chunks[(ci, cj)] = np.full((self.chunk, self.chunk), self.fill, dtype=self.dtype)
+        return self.chunks[(ci, cj)]
+
+    def __overlaps(self, low: Cell, high: Cell) -> Iterator[Tuple[Cell, Cell, Cell, Cell]]:
+        # Yields each chunk touching [low, high) with the overlapping cells as global coordinates
+        for ci in range(low[0] // self.chunk, (high[0] - 1) // self.chunk + 1):
+            for cj in range(low[1] // self.chunk, (high[1] - 1) // self.chunk + 1):
+                start = (max(low[0], ci * self.chunk), max(low[1], cj * self.chunk))
+                end = (min(high[0], (ci + 1) * self.chunk), min(high[1], (cj + 1) * self.chunk))
+                yield (ci, cj), (ci * self.chunk, cj * self.chunk), start, end
+
+    def get_region(self, low: Cell, high: Cell) -> np.ndarray:
+        region = np.full((high[0] - low[0], high[1] - low[1]), self.fill, dtype=self.dtype)
+        for key, corner, start, end in self.__overlaps(low, high):
+            if key in self.chunks:
+                region[start[0] - low[0]:end[0] - low[0], start[1] - low[1]:end[1] - low[1]] = \
+                    self.chunks[key][start[0] - corner[0]:end[0] - corner[0], start[1] - corner[1]:end[1] - corner[1]]
+        return region
+
+    def set_region(self, low: Cell, values: np.ndarray):
+        high = (low[0] + values.shape[0], low[1] + values.shape[1])
+        for key, corner, start, end in self.__overlaps(low, high):
+            self.__block(*key)[start[0] - corner[0]:end[0] - corner[0], start[1] - corner[1]:end[1] - corner[1]] = \
+                values[start[0] - low[0]:end[0] - low[0], start[1] - low[1]:end[1] - low[1]]
+
+    def __cells(self, masks: Dict[Cell, np.ndarray]) -> List[Cell]:
+        cells = []
+        for (ci, cj), mask in masks.items():
+            xs, ys = np.nonzero(mask)
+            cells.extend(zip((xs + ci * self.chunk).tolist(), (ys + cj * self.chunk).tolist()))
+        return sorted(cells)
+
+    def find(self, value) -> List[Cell]:
+        self._check_searchable(value)
+        return self.__cells({key: self.matches(block, value) for key, block in self.chunks.items()})
+
+    def count(self, value) -> int:
+        self._check_searchable(value)
+        return sum([int(np.count_nonzero(self.matches(block, value))) for block in self.chunks.values()])
+
+    def occupied(self) -> List[Cell]:
+        return self.__cells({key: ~self.is_fill(block) for key, block in self.chunks.items()})
+
+    def copy(self) -> ChunkedGrid:
+        grid = ChunkedGrid(self.fill, self.dtype, self.chunk)
+        grid.chunks = {key: block.copy() for key, block in self.chunks.items()}
+        return grid
+
+
+class SparseGrid(Grid):
+    def __init__(self, fill=0, dtype=float):
+        super().__init__(fill, dtype)
+        self.cells: Dict[Cell, object] = {}
+
+    def __getitem__(self, key: Cell):
+        return self.cells.get((key[0], key[1]), self.fill)
+
+    def __setitem__(self, key: Cell, value):
+        value = self.dtype.type(value)
+        if self.is_fill(value):
+            self.cells.pop((key[0], key[1]), None)
+        else:
+            self.cells[(key[0], key[1])] = value
+
+    def get_region(self, low: Cell, high: Cell) -> np.ndarray:
+        region = np.full((high[0] - low[0], high[1] - low[1]), self.fill, dtype=self.dtype)
+        for (x, y), value in self.cells.items():
+            if low[0] <= x < high[0] and low[1] <= y < high[1]:
+                region[x - low[0], y - low[1]] = value
+        return region
+
+    def set_region(self, low: Cell, values: np.ndarray):
+        for (i, j), value in np.ndenumerate(values):
+            self[low[0] + i, low[1] + j] = value
+
+    def find(self, value) -> List[Cell]:
+        self._check_searchable(value)
+        return sorted([cell for cell, stored in self.cells.items() if self.matches(stored, value)])
+
+    def occupied(self) -> List[Cell]:
+        return sorted(self.cells)
+
+    def copy(self) -> SparseGrid:
+        grid = SparseGrid(self.fill, self.dtype)
+        grid.cells = dict(self.cells)
+        return grid
+
+
+class Bitboard:
+    # A boolean grid with one int per row, bit y holding column y, so whole rows are tested and moved at once
+    __slots__ = ('width', 'full', 'rows')
+
+    def __init__(self, height: int, width: int, rows: Optional[List[int]] = None):
+        self.width = width
+        self.full = (1 << width) - 1
+        self.rows = rows if rows is not None else [0] * height
+
+    @classmethod
+    def from_array(cls, mask: np.ndarray) -> Bitboard:
+        height, width = mask.shape
+        packed = np.packbits(np.asarray(mask, dtype=bool), axis=1, bitorder='little')
+        return cls(height, width, [int.from_bytes(row.tobytes(), 'little') for row in packed])
+
+    def to_array(self) -> np.ndarray:
+        row_bytes = (self.width + 7) // 8
+        packed = np.frombuffer(b''.join([row.to_bytes(row_bytes, 'little') for row in self.rows]), dtype=np.uint8)
+        bits = np.unpackbits(packed.reshape(len(self.rows), row_bytes), axis=1, bitorder='little')
+        return bits[:, :self.width].astype(bool)
+
+    @property
+    def height(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, key: Cell) -> bool:
+        x, y = key
+        return 0 <= x < len(self.rows) and 0 <= y < self.width and (self.rows[x] >> y) & 1 == 1
+
+    def __setitem__(self, key: Cell, value: bool):
+        x, y = key
+        if value:
+            self.rows[x] |= 1 << y
+        else:
+            self.rows[x] &= ~(1 << y)
+
+    def copy(self) -> Bitboard:
+        return Bitboard(0, self.width, list(self.rows))
+
+    def __and__(self, other: Bitboard) -> Bitboard:
+        return Bitboard(0, self.width, [a & b for a, b in zip(self.rows, other.rows)])
+
+    def __or__(self, other: Bitboard) -> Bitboard:
+        return Bitboard(0, self.width, [a | b for a, b in zip(self.rows, other.rows)])
+
+    def __xor__(self, other: Bitboard) -> Bitboard:
+        return Bitboard(0, self.width, [a ^ b for a, b in zip(self.rows, other.rows)])
+
+    def __invert__(self) -> Bitboard:
+        return Bitboard(0, self.width, [row ^ self.full for row in self.rows])
+
+    def __eq__(self, other):
+        if not isinstance(other, Bitboard):
+            return NotImplemented
+        return self.width == other.width and self.rows == other.rows
+
+    def __hash__(self):
+        return hash((self.width, tuple(self.rows)))
+
+    def __bool__(self):
+        return any(self.rows)
+
+    def count(self) -> int:
+        return sum([row.bit_count() for row in self.rows])
+
+    def cells(self) -> List[Cell]:
+        cells = []
+        for x, row in enumerate(self.rows):
+            while row:
+                low = row & -row
+                cells.append((x, low.bit_length() - 1))
+                row ^= low
+        return cells
+
+    @property
+    def bounds(self) -> Optional[Tuple[Cell, Cell]]:
+        xs = [x for x, row in enumerate(self.rows) if row]
+        if not xs:
+            return None
+        columns = 0
+        for row in self.rows:
+            columns |= row
+        return (xs[0], (columns & -columns).bit_length() - 1), (xs[-1], columns.bit_length() - 1)
+
+    def shifted(self, dx: int, dy: int) -> Bitboard:
+        # Cell (x, y) of the result holds cell (x - dx, y - dy); whatever moves off the board is lost
+        rows = [(row << dy if dy >= 0 else row >> -dy) & self.full for row in self.rows] if dy else self.rows
+        if dx > 0:
+            rows = [0] * min(dx, len(rows)) + rows[:max(len(rows) - dx, 0)]
+        elif dx < 0:
+            rows = rows[-dx:] + [0] * min(-dx, len(rows))
+        return Bitboard(0, self.width, rows if rows is not self.rows else list(rows))
+
+    def rotated(self, dx: int, dy: int) -> Bitboard:
+        # Like shifted, but what moves off one edge comes back in at the opposite one
+        dy %= self.width
+        rows = [((row << dy) | (row >> (self.width - dy))) & self.full for row in self.rows] if dy else self.rows
+        dx %= len(rows) if rows else 1
+        return Bitboard(0, self.width, rows[len(rows) - dx:] + rows[:len(rows) - dx])
+
+    def padded(self, margin: int) -> Bitboard:
+        empty = [0] * margin
+        return Bitboard(0, self.width + 2 * margin, empty + [row << margin for row in self.rows] + empty)
+
+    def window(self, start: int, stop: int) -> int:
+        # Rows start..stop as one int, a cheap hashable key for the shape of part of the board
+        key = 0
+        for row in self.rows[max(start, 0):stop]:
+            key = (key << self.width) | row
+        return key
+
+    def overlaps(self, shape: List[int], x: int, y: int) -> bool:
+        # shape is a list of row bits placed with its first row on row x and shifted y columns;
+        # everything outside the columns or below row 0 is solid, rows past the top are empty
+        if x < 0 or y < 0:
+            return True
+        for i, bits in enumerate(shape):
+            bits <<= y
+            if bits & ~self.full or (x + i < len(self.rows) and self.rows[x + i] & bits):
+                return True
+        return False
+
+    def place(self, shape: List[int], x: int, y: int):
+        if x + len(shape) > len(self.rows):
+            self.rows.extend([0] * (x + len(shape) - len(self.rows)))
+        for i, bits in enumerate(shape):
+            self.rows[x + i] |= bits << y
+
+
 class GraphNode:
     def __init__(self, id: int, adj_list: List[int]):
         self.id = id
@@ -214,54 +1203,66 @@ class GraphNode:
 
 
 class Graph:
-    def __init__(self, nodes: List[GraphNode], edge_costs: np.array):
+    DENSE = 0.25
+    SMALL = 256
+
+    def __init__(self, nodes: List[GraphNode], edge_costs: np.ndarray):
         self.nodes = nodes
         self.edge_costs = edge_costs
-        self.shortest_paths = edge_costs.copy()
-        self.current_cost = 0
-        self.visited = List[GraphNode]
+        self.shortest_paths = np.asarray(edge_costs, dtype=np.int64).copy()
+        self.by_id = {n.id: n for n in nodes}
 
     @property
     def num_nodes(self):
         return len(self.nodes)
 
     @property
-    def unvisited_nodes(self):
-        unvisited = [n for n in self.nodes if n not in self.visited]
-        unvisited.sort(key=lambda n: n.cost)
-        return unvisited
+    def num_edges(self):
+        return sum([len(n.adj_list) for n in self.nodes])
+
+    @property
+    def unit_weights(self):
+        return all([self.edge_costs[n.id, i] == 1 for n in self.nodes for i in n.adj_list])
 
     def get_node(self, id: int):
-        return next(iter(n for n in self.nodes if n.id == id))
+        return self.by_id[id]
 
-    def find_all_shortest_paths(self):
+    def find_all_shortest_paths(self, method: Optional[str] = None):
+        method = method or self.choose_method()
+        if method == 'floyd_warshall':
+            self.shortest_paths = self.floyd_warshall()
+            return
+        from_source = self.bfs if method == 'bfs' else self.dijkstra
         for n in self.nodes:
-            self.__find_shortest_paths(n)
+            self.shortest_paths[n.id, :] = from_source(n)
 
-    def __find_shortest_paths(self, starting_node: GraphNode):
-        self.visited, self.current_cost = [], 0
-        for n in self.nodes:
-            n.cost = LARGE
-        current = starting_node
-        current.cost = 0
-
-        done = False
-        while not done:
-            neighbors = self.__get_unvisited_neighbors(current)
-            self.__update_costs_for_neighbors(current, neighbors)
-            self.visited.append(current)
-            if not len(self.visited) == self.num_nodes:
-                current = self.unvisited_nodes[0]
-            else:
-                done = True
+    def choose_method(self) -> str:
+        # Vectorised Floyd-Warshall wins while V^3 stays small or most node pairs are joined anyway
+        if self.num_nodes <= self.SMALL or self.num_edges >= self.DENSE * self.num_nodes ** 2:
+            return 'floyd_warshall'
+        return 'bfs' if self.unit_weights else 'dijkstra'
+
+    def floyd_warshall(self) -> np.ndarray:
+        size = self.shortest_paths.shape[0]
+        costs = np.full((size, size), LARGE, dtype=np.int64)
         for n in self.nodes:
-            self.shortest_paths[starting_node.id, n.id] = n.cost
-            self.shortest_paths[n.id, starting_node.id] = n.cost
+            costs[n.id, n.adj_list] = np.asarray(self.edge_costs, dtype=np.int64)[n.id, n.adj_list]
+        np.fill_diagonal(costs, 0)
+        for k in range(size):
+            np.minimum(costs, costs[:, k, None] + costs[None, k, :], out=costs)
+        return np.minimum(costs, LARGE)
+
+    def dijkstra(self, start: GraphNode) -> np.ndarray:
+        def neighbors(id: int):
+            return [(i, int(self.edge_costs[id, i])) for i in self.by_id[id].adj_list]
+        return self.__costs_row(search.dijkstra([start.id], neighbors, name='graph').costs)
 
-    def __get_unvisited_neighbors(self, current: GraphNode) -> List[GraphNode]:
-        return [self.get_node(i) for i in current.adj_list if self.get_node(i) not in self.visited]
+    def bfs(self, start: GraphNode) -> np.ndarray:
+        costs: Dict[int, int] = {}
+        search.bfs([start.id], lambda id: self.by_id[id].adj_list, costs=costs, name='graph')
+        return self.__costs_row(costs)
 
-    def __update_costs_for_neighbors(self, current: GraphNode, neighbors: List[GraphNode]):
-        for neighbor in neighbors:
-            neighbor.cost = min(neighbor.cost,
-                                current.cost + self.edge_costs[current.id, neighbor.id])
+    def __costs_row(self, costs: Dict[int, int]) -> np.ndarray:
+        row = np.full(self.shortest_paths.shape[0], LARGE, dtype=np.int64)
+        row[list(costs)] = list(costs.values())
+        return row